@@ -1,7 +1,7 @@
 import streamlit as st
-import requests
 import os
 from db_utils import init_db, get_analysis_count
+from http_utils import probe_backend
 
 # Page configuration
 st.set_page_config(
@@ -42,17 +42,7 @@ def check_backend() -> str:
       "suspended" — Render monthly limit page detected
       "offline"   — timeout, connection error, or unexpected response
     """
-    try:
-        response = requests.get(f"{BACKEND_URL}/health", timeout=8)
-        if "suspended" in response.text.lower() or "service has been suspended" in response.text.lower():
-            return "suspended"
-        if response.status_code == 200:
-            return "online"
-        return "offline"
-    except requests.exceptions.Timeout:
-        return "offline"
-    except Exception:
-        return "offline"
+    return probe_backend(BACKEND_URL)
 
 # Bypass health check entirely when running locally
 backend_status = "online" if IS_LOCAL else check_backend()
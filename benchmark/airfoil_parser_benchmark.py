@@ -94,8 +94,17 @@ def load_parser():
     """
     try:
         sys.path.insert(0, os.getcwd())
-        from main import parse_dat_file, detect_and_merge_sections  # type: ignore
+        import main  # type: ignore
         print("[parser] Using parse functions imported from main.py")
+
+        # main.py returns (coords_ndarray, fixes); the benchmark only needs
+        # the coordinates, as a plain list like the bundled copy returns.
+        def parse_dat_file(file_path):
+            return main.parse_dat_file(file_path)[0].tolist()
+
+        def detect_and_merge_sections(data_lines):
+            return main.detect_and_merge_sections(data_lines)[0].tolist()
+
         return parse_dat_file, detect_and_merge_sections
     except Exception as e:
         print(f"[parser] Could not import from main.py ({e}); using bundled copy.")
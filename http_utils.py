@@ -0,0 +1,40 @@
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = "AeroLab/1"
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    One keep-alive connection pool per server process, shared by every page.
+    Page scripts are re-run on every interaction, so a plain module global
+    would not persist.
+    """
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def probe_backend(backend_url: str) -> str:
+    """
+    Returns "online", "suspended" or "offline" for the backend at backend_url.
+
+    A HEAD request with a short timeout answers the common cases: a healthy
+    backend returns its JSON headers with no body, and a sleeping one times
+    out quickly. Only other responses are fetched in full to look for
+    Render's suspension page.
+    """
+    session = get_http_session()
+    try:
+        r = session.head(f"{backend_url}/health", timeout=2, allow_redirects=True)
+        if r.status_code == 200 and r.headers.get("content-type", "").startswith("application/json"):
+            return "online"
+        r = session.get(f"{backend_url}/health", timeout=6)
+        if "suspended" in r.text.lower():
+            return "suspended"
+        return "online" if r.status_code == 200 else "offline"
+    except Exception:
+        return "offline"
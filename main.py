@@ -1,13 +1,24 @@
 import subprocess
 import os
 import re
+import io
 import platform
 import time
-import uuid
 import shutil
+import signal
+import tempfile
+import queue
 import asyncio
+import warnings
+import hashlib
+import zlib
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+import numpy as np
+import orjson
 from fastapi import FastAPI, UploadFile, Form, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -16,14 +27,43 @@ from anyio import to_thread
 import logging
 
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 logger = logging.getLogger(__name__)
 
-limiter = Limiter(key_func=get_remote_address)
-app = FastAPI(title="Student Airfoil CFD Tool")
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson — serialises numpy arrays natively in C."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    to_thread.current_default_thread_limiter().total_tokens = ANYIO_THREADS
+    xfoil_pool.start()
+    work_dirs.start()
+    sweeper = asyncio.create_task(sweep_stale_dirs_forever())
+    yield
+    sweeper.cancel()
+    await xfoil_pool.shutdown()
+    work_dirs.shutdown()
+
+
+# memory:// keeps counters per worker process; point this at a shared store
+# (e.g. redis://host:6379) so limits hold across WEB_WORKERS > 1.
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=os.getenv("RATE_LIMIT_STORAGE_URI", "memory://"),
+)
+app = FastAPI(
+    title="Student Airfoil CFD Tool",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -37,23 +77,528 @@ app.add_middleware(
 )
 
 MAX_FILE_SIZE = 1 * 1024 * 1024
+UPLOAD_CHUNK  = 64 * 1024
+GZIP_MAGIC    = b"\x1f\x8b"
 MAX_POINTS    = 500
 MIN_POINTS    = 10
 MIN_REYNOLDS  = 1e4
 MAX_REYNOLDS  = 1e7
 MIN_ALPHA     = -10
 MAX_ALPHA     = 20
+MIN_CHORD     = 0.5
+TE_X_TOL      = 0.02
+X_MONOTONE_TOL = 1e-3     # x/c backtracking tolerated as digitising noise
+XFOIL_PANEL_NODES = 160   # PANE's default PPAR N
+MAX_SPACING_RATIO = 4.0   # largest adjacent panel-length ratio kept without PANE
+MIN_THICKNESS = 1e-4
+
+SWEEP_INTERVAL   = 300    # seconds between stale work-dir sweeps
+SWEEP_MAX_AGE    = 3600   # run_* dirs older than this are abandoned
+
+MAX_POLAR_POINTS = 41
+POLAR_TIMEOUT    = 180
+
+# XFOIL is CPU-bound, so concurrent runs are capped at the core count. XFOIL
+# runs as asyncio subprocesses and holds no thread; the anyio thread limiter
+# (default 40) only bounds the parse/write/cleanup work offloaded per request.
+XFOIL_CONCURRENCY = int(os.getenv("XFOIL_CONCURRENCY", str(os.cpu_count() or 3)))
+ANYIO_THREADS     = int(os.getenv("ANYIO_THREADS", "128"))
+xfoil_semaphore = asyncio.Semaphore(XFOIL_CONCURRENCY)
+
+# Solves allowed to wait for a free slot before new ones are turned away
+# with 503, so an overload sheds load instead of queueing until timeouts.
+XFOIL_MAX_QUEUE = int(os.getenv("XFOIL_MAX_QUEUE", str(XFOIL_CONCURRENCY * 4)))
+_xfoil_waiting  = 0
+
+
+@asynccontextmanager
+async def xfoil_slot():
+    """Hold one of the XFOIL_CONCURRENCY solver slots; 503 if the queue is full."""
+    global _xfoil_waiting
+    if xfoil_semaphore.locked() and _xfoil_waiting >= XFOIL_MAX_QUEUE:
+        raise HTTPException(status_code=503, detail="Server busy, please retry shortly",
+                            headers={"Retry-After": "10"})
+    _xfoil_waiting += 1
+    try:
+        await xfoil_semaphore.acquire()
+    finally:
+        _xfoil_waiting -= 1
+    try:
+        yield
+    finally:
+        xfoil_semaphore.release()
 
-xfoil_semaphore = asyncio.Semaphore(3)
 
-if platform.system() == "Windows":
+async def try_xfoil_slot() -> bool:
+    """Take a solver slot only if one is free right now; never waits."""
+    if xfoil_semaphore.locked():
+        return False
+    # An uncontended acquire completes without yielding, so no other task
+    # can take the slot between the check and here.
+    await xfoil_semaphore.acquire()
+    return True
+
+PLATFORM_NAME = platform.system()
+
+if PLATFORM_NAME == "Windows":
     XFOIL_EXE = os.getenv("XFOIL_PATH", "xfoil.exe")
     IS_WINDOWS = True
     TMP_DIR = os.getcwd()
 else:
     XFOIL_EXE = os.getenv("XFOIL_PATH", "xfoil")
     IS_WINDOWS = False
-    TMP_DIR = "/tmp"
+    # Scratch files (coords, CPWR/DUMP output, XFOIL stdout) are small and
+    # short-lived; keep them in RAM on tmpfs when it is available.
+    TMP_DIR = os.getenv("XFOIL_TMP") or ("/dev/shm" if os.access("/dev/shm", os.W_OK) else "/tmp")
+
+# Resolved once: spawns skip the PATH search and /health needs no lookup.
+XFOIL_RESOLVED = shutil.which(XFOIL_EXE) or (XFOIL_EXE if os.path.exists(XFOIL_EXE) else None)
+
+
+class _PopenProcess:
+    """
+    The parts of asyncio.subprocess.Process that XfoilPool uses, over a
+    plain subprocess.Popen. Used when the running event loop cannot spawn
+    subprocesses: on Windows, uvicorn installs the selector loop for
+    --reload and --workers > 1. The blocking wait runs in a worker thread.
+    """
+
+    def __init__(self, popen: subprocess.Popen):
+        self._popen = popen
+        self.pid    = popen.pid
+        self.stdin  = self
+
+    @property
+    def returncode(self):
+        return self._popen.poll()
+
+    # stdin: scripts are a few hundred bytes, far below the pipe buffer,
+    # so these writes never block.
+    def write(self, data: bytes):
+        self._popen.stdin.write(data)
+
+    async def drain(self):
+        self._popen.stdin.flush()
+
+    def close(self):
+        try:
+            self._popen.stdin.close()
+        except OSError:
+            pass      # XFOIL already exited
+
+    def kill(self):
+        self._popen.kill()
+
+    async def wait(self):
+        # asyncio.to_thread (not anyio's) so wait_for can time out: the
+        # thread is abandoned and returns once _discard has killed XFOIL.
+        return await asyncio.to_thread(self._popen.wait)
+
+
+class XfoilPool:
+    """
+    Keeps a few XFOIL processes already started and parked at the top-level
+    prompt, so a solve does not pay fork/exec + Fortran start-up on the
+    request path.
+
+    XFOIL carries OPER state (VISC is a toggle, ITER, last solution) from one
+    command to the next, so a process is never reused: each one runs exactly
+    one script and exits on QUIT, and a replacement is spawned in the
+    background as soon as a spare is handed out.
+
+    Processes are asyncio subprocesses driven by the event loop, so a running
+    solve does not hold a worker thread. Must be used from the event loop.
+    """
+
+    # Sent while the process is still idle: turn graphics off so XFOIL never
+    # touches the X display (same trick as benchmark/airfoil_parser_benchmark.py).
+    WARMUP = b"PLOP\nG\n\n"
+
+    def __init__(self, size: int):
+        self.size      = size
+        self._spares   = deque()
+        self._refills  = set()
+        self._running  = False
+        self.use_popen = False
+
+    async def _spawn(self):
+        # stdout/stderr go to anonymous temp files rather than pipes, so no
+        # reader tasks or in-memory buffering are needed while XFOIL runs.
+        out = tempfile.TemporaryFile(dir=TMP_DIR)
+        err = tempfile.TemporaryFile(dir=TMP_DIR)
+        spawn_args = dict(
+            stdin=subprocess.PIPE,
+            stdout=out,
+            stderr=err,
+            cwd=TMP_DIR,
+            # Own process group, so a kill also reaches anything XFOIL
+            # (or a wrapper such as xvfb-run) has forked.
+            start_new_session=not IS_WINDOWS,
+        )
+        try:
+            proc = None
+            if not self.use_popen:
+                try:
+                    proc = await asyncio.create_subprocess_exec(
+                        XFOIL_RESOLVED or XFOIL_EXE, **spawn_args)
+                except NotImplementedError:
+                    logger.warning("Event loop cannot spawn subprocesses; "
+                                   "running XFOIL through Popen and threads")
+                    self.use_popen = True
+            if proc is None:
+                proc = _PopenProcess(subprocess.Popen(
+                    [XFOIL_RESOLVED or XFOIL_EXE], **spawn_args))
+        except BaseException:
+            out.close()
+            err.close()
+            raise
+        proc.out_file, proc.err_file = out, err
+        try:
+            proc.stdin.write(self.WARMUP)
+        except OSError:
+            await self._discard(proc)    # also closes out/err
+            raise
+        return proc
+
+    @staticmethod
+    async def run(proc, script: str, timeout: float):
+        """
+        Feed script to an acquired process, wait for it to exit and return
+        (stdout, stderr). The process is always dead and its output files
+        closed on return; subprocess.TimeoutExpired propagates after killing
+        it, as with Popen.
+        """
+        try:
+            proc.stdin.write(script.encode())
+            await proc.stdin.drain()
+            proc.stdin.close()
+            try:
+                await asyncio.wait_for(proc.wait(), timeout)
+            except asyncio.TimeoutError:
+                raise subprocess.TimeoutExpired(XFOIL_EXE, timeout)
+            outputs = []
+            for f in (proc.out_file, proc.err_file):
+                f.seek(0)
+                outputs.append(f.read().decode("utf-8", "replace"))
+            return outputs[0], outputs[1]
+        finally:
+            await XfoilPool._discard(proc)
+
+    async def _refill(self):
+        try:
+            self._spares.append(await self._spawn())
+        except Exception as e:
+            logger.warning("Could not pre-spawn XFOIL worker: %s", e)
+
+    def _schedule_refill(self):
+        task = asyncio.create_task(self._refill())
+        self._refills.add(task)
+        task.add_done_callback(self._refills.discard)
+
+    def start(self):
+        self._running = True
+        for _ in range(self.size):
+            self._schedule_refill()
+
+    async def acquire(self):
+        """Return a live XFOIL process (cwd=TMP_DIR) ready to read a script."""
+        while self._spares:
+            proc = self._spares.popleft()
+            if self._running:
+                self._schedule_refill()
+            if proc.returncode is None:
+                return proc
+            await self._discard(proc)
+        # Pool not started (e.g. called outside the app) or drained: cold start.
+        return await self._spawn()
+
+    async def shutdown(self):
+        self._running = False
+        for task in list(self._refills):
+            task.cancel()
+        await asyncio.gather(*self._refills, return_exceptions=True)
+        while self._spares:
+            await self._discard(self._spares.popleft())
+
+    @staticmethod
+    async def _discard(proc):
+        """
+        SIGKILL the process group (POSIX) or the process if still running,
+        reap it and close its output files.
+        """
+        # Only signal while the leader is unreaped: once it has been
+        # collected, its pid (and so its group id) may belong to a new spare.
+        if proc.returncode is None:
+            try:
+                if IS_WINDOWS:
+                    proc.kill()
+                else:
+                    os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        await proc.wait()
+        proc.out_file.close()
+        proc.err_file.close()
+
+
+xfoil_pool = XfoilPool(size=XFOIL_CONCURRENCY)
+
+
+# All per-request work dirs live in this app-owned subdirectory of TMP_DIR,
+# so the stale-dir sweep never touches anything another program put there.
+WORK_SUBDIR = "airfoil-xfoil"
+
+
+def work_root() -> str:
+    """Return the app's work-dir root under TMP_DIR, creating it if needed."""
+    root = os.path.join(TMP_DIR, WORK_SUBDIR)
+    os.makedirs(root, exist_ok=True)
+    return root
+
+
+class WorkDirPool:
+    """
+    Bounded set of pre-created per-request working directories. Releasing a
+    directory unlinks the handful of files a run is known to produce instead
+    of rmtree-ing and re-creating it. When every directory is in use a
+    throwaway mkdtemp directory is handed out and removed on release.
+    """
+
+    RUN_FILES = (
+        "airfoil.dat", "cp_output.txt", "bl_output.txt", "xfoil_output.log",
+        "cp_inviscid.txt", "xfoil_inviscid.log", "polar.out",
+    )
+
+    def __init__(self, size: int):
+        self.size    = size
+        self._free   = queue.Queue()
+        self._pooled = set()
+
+    def start(self):
+        # pid in the name keeps multiple uvicorn workers from sharing dirs.
+        root = work_root()
+        for i in range(self.size):
+            path = os.path.join(root, f"pool_{os.getpid()}_{i}")
+            os.makedirs(path, exist_ok=True)
+            self._clear(path)
+            self._pooled.add(path)
+            self._free.put(path)
+
+    def acquire(self) -> str:
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            return tempfile.mkdtemp(prefix="run_", dir=work_root())
+
+    def release(self, path: str):
+        """Clean path and return it to the pool; never raises."""
+        try:
+            if path not in self._pooled:
+                shutil.rmtree(path, ignore_errors=True)
+                return
+            self._clear(path)
+            self._free.put(path)
+        except Exception as e:
+            logger.warning("Could not recycle work dir %s: %s", path, e)
+
+    def _clear(self, path: str):
+        for name in self.RUN_FILES:
+            try:
+                os.unlink(os.path.join(path, name))
+            except FileNotFoundError:
+                pass
+        # Anything unexpected left behind: start the directory over.
+        if os.listdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+            os.makedirs(path, exist_ok=True)
+
+    def shutdown(self):
+        for path in self._pooled:
+            shutil.rmtree(path, ignore_errors=True)
+        self._pooled.clear()
+        self._free = queue.Queue()
+
+
+work_dirs = WorkDirPool(size=XFOIL_CONCURRENCY * 2)
+
+
+def sweep_stale_dirs(max_age: float):
+    """
+    Remove working directories a crashed or killed process left under
+    TMP_DIR/WORK_SUBDIR: mkdtemp fallbacks (run_*) older than max_age, and
+    pool directories (pool_<pid>_*) whose owning process is gone. Nothing
+    outside that subdirectory is looked at. Returns the number removed.
+    """
+    root = os.path.join(TMP_DIR, WORK_SUBDIR)
+    try:
+        names = os.listdir(root)
+    except FileNotFoundError:
+        return 0
+    now = time.time()
+    removed = 0
+    for name in names:
+        path = os.path.join(root, name)
+        try:
+            if name.startswith("run_"):
+                stale = now - os.path.getmtime(path) > max_age
+            elif name.startswith("pool_") and not IS_WINDOWS:
+                stale = not _pid_alive(int(name.split("_")[1]))
+            else:
+                continue
+        except (OSError, ValueError, IndexError):
+            continue
+        if stale and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+async def sweep_stale_dirs_forever():
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        try:
+            removed = await to_thread.run_sync(sweep_stale_dirs, SWEEP_MAX_AGE)
+            if removed:
+                logger.info("Swept %d stale work dir(s)", removed)
+        except Exception as e:
+            logger.warning("Work dir sweep failed: %s", e)
+
+
+class ResultCache:
+    """
+    In-process LRU of finished XFOIL runs keyed by
+    (geometry digest, reynolds, alpha). A solve is a pure function of those
+    inputs, so repeat submissions (common in classroom use) skip XFOIL
+    entirely. The in-memory LRU is only touched from the event loop, so no
+    locking is needed.
+
+    With disk_dir set, entries are also written there as orjson files, which
+    are shared across uvicorn workers and survive restarts. load/store are
+    blocking and meant to be run in a worker thread.
+    """
+
+    def __init__(self, maxsize: int, disk_dir: str = None):
+        self.maxsize  = maxsize
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def key(coords, reynolds: float, alpha: float):
+        digest = hashlib.blake2b(np.ascontiguousarray(coords).tobytes(), digest_size=16).digest()
+        return digest, float(reynolds), float(alpha)
+
+    @staticmethod
+    def cacheable(value) -> bool:
+        """
+        Only viscous results are cached. run_xfoil marks its inviscid
+        fallback with coefficients["mode"], and that fallback is often reached
+        only because the viscous strategies timed out under load, so caching
+        it would pin a degraded answer (no BL data) to the key.
+        """
+        return value[2].get("mode") == "viscous"
+
+    def get(self, key):
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:
+            return None
+        return self._entries[key]
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key) -> str:
+        digest, reynolds, alpha = key
+        name = hashlib.blake2b(digest + f"{reynolds!r}:{alpha!r}".encode(), digest_size=16)
+        return os.path.join(self.disk_dir, name.hexdigest() + ".json")
+
+    def load(self, key):
+        """Disk lookup; returns the cached tuple or None."""
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                d = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        value = d["cp_x"], d["cp_values"], d["coefficients"], d["bl_data"]
+        # Skips inviscid fallbacks persisted before store() checked this.
+        return value if self.cacheable(value) else None
+
+    def store(self, key, value):
+        """Write an entry to disk atomically; failures are logged and ignored."""
+        if not self.cacheable(value):
+            return
+        cp_x, cp_values, coefficients, bl_data = value
+        path = self._disk_path(key)
+        tmp = None
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            # A unique temp name per write: concurrent stores of the same key
+            # (threads or workers) must not share one file before the rename.
+            with tempfile.NamedTemporaryFile(dir=self.disk_dir, suffix=".tmp", delete=False) as f:
+                tmp = f.name
+                f.write(orjson.dumps(
+                    {"cp_x": cp_x, "cp_values": cp_values,
+                     "coefficients": coefficients, "bl_data": bl_data},
+                    option=orjson.OPT_SERIALIZE_NUMPY,
+                ))
+            os.replace(tmp, path)
+        except (OSError, TypeError) as e:
+            logger.warning("Could not persist cached result: %s", e)
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+
+result_cache = ResultCache(
+    maxsize=int(os.getenv("RESULT_CACHE_SIZE", "512")),
+    disk_dir=os.getenv("RESULT_CACHE_DIR") or None,
+)
+
+
+_NONBLANK_LINE_RE = re.compile(r"^[ \t]*\S", re.MULTILINE)
+# CDp must precede CD in the alternation so the longer key wins.
+_COEFF_RE = re.compile(r"\b(CL|CDp|CD|Cm)\s*=\s*([-+]?\d*\.?\d+)")
+_PANEL_NODES_RE = re.compile(r"Number of panel nodes\s+(\d+)")
+COEFF_TAIL_CHARS = 4096
+PANEL_HEAD_CHARS = 8192
+
+
+def _load_columns(source, ncols: int):
+    """
+    Read the first ncols numeric columns of a whitespace-separated text file
+    (path or file-like) into an (N, ncols) float64 array using NumPy's C
+    parser. Header, comment and malformed rows are dropped; non-finite rows too.
+    """
+    with warnings.catch_warnings():
+        # genfromtxt warns once per malformed row it skips
+        warnings.simplefilter("ignore")
+        arr = np.genfromtxt(source, usecols=tuple(range(ncols)), invalid_raise=False,
+                            comments=None, dtype=np.float64, ndmin=2)
+    if arr.size == 0:
+        return np.empty((0, ncols))
+    return arr[np.isfinite(arr).all(axis=1)]
+
+
+def _load_xy(source):
+    """(N, 2) x/y columns of a coordinate or CPWR file; see _load_columns."""
+    return _load_columns(source, 2)
 
 
 def parse_dat_file(file_path: str):
@@ -64,42 +609,35 @@ def parse_dat_file(file_path: str):
     """
     try:
         with open(file_path, "r") as f:
-            lines = f.readlines()
+            text = f.read()
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to parse file: {str(e)}")
+    return parse_dat_text(text)
 
+
+def parse_dat_text(text: str):
+    """parse_dat_file for contents already in memory, e.g. an upload body."""
+    try:
         fixes = []
-        data_lines = []
-        skipped_non_coord = 0
-        skipped_out_of_range = 0
+        n_lines = len(_NONBLANK_LINE_RE.findall(text))
+        arr = _load_xy(io.StringIO(text))
+        skipped_non_coord = n_lines - len(arr)
 
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                continue
-            parts = stripped.split()
-            if len(parts) < 2:
-                skipped_non_coord += 1
-                continue
-            try:
-                x = float(parts[0])
-                y = float(parts[1])
-                if -0.5 <= x <= 1.5 and -1.0 <= y <= 1.0:
-                    data_lines.append([x, y])
-                else:
-                    skipped_out_of_range += 1
-            except (ValueError, IndexError):
-                skipped_non_coord += 1
-                continue
+        x, y = arr[:, 0], arr[:, 1]
+        in_range = (x >= -0.5) & (x <= 1.5) & (y >= -1.0) & (y <= 1.0)
+        skipped_out_of_range = int(np.count_nonzero(~in_range))
+        arr = arr[in_range]
 
         if skipped_non_coord > 0:
             fixes.append(f"Non-coordinate lines skipped: {skipped_non_coord} header/comment line(s) removed")
         if skipped_out_of_range > 0:
             fixes.append(f"Out-of-range points filtered: {skipped_out_of_range} point(s) outside valid bounds removed")
 
-        if len(data_lines) < 10:
+        if len(arr) < 10:
             raise HTTPException(status_code=400,
-                detail=f"Insufficient valid coordinates. Found {len(data_lines)} points.")
+                detail=f"Insufficient valid coordinates. Found {len(arr)} points.")
 
-        coords, geom_fixes = detect_and_merge_sections(data_lines)
+        coords, geom_fixes = detect_and_merge_sections(arr)
         fixes.extend(geom_fixes)
 
         if not fixes:
@@ -116,59 +654,54 @@ def parse_dat_file(file_path: str):
 def detect_and_merge_sections(data_lines):
     """
     Detect format and merge if needed.
-    Returns (coords, fixes) where fixes is a list of repair descriptions.
+    Accepts an (N, 2) array-like of points and returns (coords, fixes) where
+    coords is a C-contiguous (M, 2) ndarray and fixes is a list of repair
+    descriptions.
     """
     fixes = []
-    x_coords = [pt[0] for pt in data_lines]
-    section_break = None
-    for i in range(1, len(data_lines)):
-        if x_coords[i] < 0.01 and x_coords[i-1] > 0.5:
-            section_break = i
-            break
+    arr = np.asarray(data_lines, dtype=np.float64)
+    x = arr[:, 0]
+    breaks = np.flatnonzero((x[1:] < 0.01) & (x[:-1] > 0.5))
+    section_break = int(breaks[0]) + 1 if breaks.size else None
 
     if section_break is not None:
-        upper = data_lines[:section_break]
-        lower = data_lines[section_break:]
-        logger.debug(f"Lednicer format: {len(upper)} upper, {len(lower)} lower")
+        upper = arr[:section_break]
+        lower = arr[section_break:]
+        logger.debug("Lednicer format: %d upper, %d lower", len(upper), len(lower))
         fixes.append(
             f"Lednicer format detected and converted: two-section format "
             f"({len(upper)} upper + {len(lower)} lower points) merged into "
             f"a single Selig-format loop for XFOIL"
         )
         # Ensure upper goes LE->TE first, then reverse to TE->LE for XFOIL
-        if upper[0][0] > upper[-1][0]:
-            upper = list(reversed(upper))
-        upper = list(reversed(upper))
+        if upper[0, 0] > upper[-1, 0]:
+            upper = upper[::-1]
+        upper = upper[::-1]
         # Ensure lower goes LE->TE
-        if lower[0][0] > lower[-1][0]:
-            lower = list(reversed(lower))
+        if lower[0, 0] > lower[-1, 0]:
+            lower = lower[::-1]
         # Both sections share the LE point (0,0) — remove duplicate from lower
-        if lower and abs(lower[0][0]) < 0.001 and abs(lower[0][1]) < 0.001:
+        if len(lower) and abs(lower[0, 0]) < 0.001 and abs(lower[0, 1]) < 0.001:
             lower = lower[1:]
             fixes.append("Duplicate leading-edge point removed from Lednicer lower section")
             logger.debug("Removed duplicate LE point from Lednicer lower section")
-        merged = upper + lower
+        merged = np.concatenate([upper, lower])
     else:
-        logger.debug(f"Single section: {len(data_lines)} points")
-        if x_coords[0] > 0.99 and x_coords[-1] > 0.99:
-            le_idx = x_coords.index(min(x_coords))
+        logger.debug("Single section: %d points", len(arr))
+        merged = arr
+        if x[0] > 0.99 and x[-1] > 0.99:
+            le_idx = int(np.argmin(x))
             if le_idx > 0:
-                point_before_le_y = data_lines[le_idx - 1][1]
-                if point_before_le_y > 0:
+                if arr[le_idx - 1, 1] > 0:
                     logger.debug("TE-to-TE format, correct order (TE->upper->LE->lower->TE)")
-                    merged = data_lines
                 else:
                     logger.debug("TE-to-TE format, reversing (was TE->lower->LE->upper->TE)")
-                    merged = list(reversed(data_lines))
+                    merged = arr[::-1]
                     fixes.append(
                         "Winding order corrected: coordinates were in reversed order "
                         "(TE→lower→LE→upper→TE) and have been reversed to the correct "
                         "Selig order (TE→upper→LE→lower→TE)"
                     )
-            else:
-                merged = data_lines
-        else:
-            merged = data_lines
 
     # NOTE: Do NOT strip a coincident first/last point here.
     # For a Selig-format airfoil the coordinate list is a single closed loop
@@ -177,22 +710,97 @@ def detect_and_merge_sections(data_lines):
     # Removing that final point opens the trailing edge, producing a large
     # TE gap that XFOIL reports as a "Blunt trailing edge" and then fails to
     # converge on. XFOIL handles a closed loop correctly, so we keep it.
-    return merged, fixes
+    # Reversed slices are strided views; orjson only serialises contiguous arrays.
+    return np.ascontiguousarray(merged), fixes
+
+
+def validate_coords(coords):
+    """
+    Cheap geometry sanity checks run before any XFOIL process is spawned.
+    Rejects contours XFOIL cannot solve (degenerate chord, collinear points,
+    a loop that does not start and end at the trailing edge, or x doubling
+    back along a surface) with a 400 instead of letting them burn through
+    every solver strategy.
+    """
+    arr = np.asarray(coords, dtype=np.float64)
+    if arr.ndim != 2 or arr.shape[0] < MIN_POINTS:
+        raise HTTPException(status_code=400,
+            detail=f"Insufficient valid coordinates. Found {len(arr)} points.")
+
+    x, y = arr[:, 0], arr[:, 1]
+    chord = x.max() - x.min()
+    if chord < MIN_CHORD:
+        raise HTTPException(status_code=400,
+            detail=f"Degenerate geometry: chord extent {chord:.3f} is too small "
+                   f"(expected coordinates normalised to x/c from 0 to 1)")
+    if y.max() - y.min() < MIN_THICKNESS:
+        raise HTTPException(status_code=400,
+            detail="Degenerate geometry: all points are collinear (zero thickness)")
+
+    te_x = x.max()
+    if te_x - x[0] > TE_X_TOL or te_x - x[-1] > TE_X_TOL:
+        raise HTTPException(status_code=400,
+            detail="Open contour: coordinates must start and end at the trailing edge "
+                   "(TE → upper → LE → lower → TE)")
+
+    # x must fall from the TE to the LE and rise back again; a reversal
+    # larger than digitising noise means a self-crossing or shuffled file.
+    le = int(np.argmin(x))
+    tol = X_MONOTONE_TOL * chord
+    dx = np.diff(x)
+    bad = np.flatnonzero(np.concatenate((dx[:le] > tol, dx[le:] < -tol)))
+    if bad.size:
+        i = int(bad[0])
+        raise HTTPException(status_code=400,
+            detail=f"Non-monotonic x between points {i + 1} and {i + 2} "
+                   f"(x={x[i]:.4f} → {x[i + 1]:.4f}): x must decrease from the "
+                   f"trailing edge to the leading edge and increase back")
+
+
+def needs_repanel(coords) -> bool:
+    """
+    False when the contour is laid out the way PANE would leave it: a point
+    count within one of PANE's default N=160 nodes, a single interior
+    leading edge with x non-increasing over the upper surface and
+    non-decreasing over the lower, and smoothly graded node spacing (no
+    coincident points, adjacent panel lengths within MAX_SPACING_RATIO of
+    each other, and panels at the leading edge finer than the median).
+    A file that passes but still fails to converge costs one retry, since
+    the smoothed and inviscid fallbacks always re-panel.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    if not (XFOIL_PANEL_NODES - 1 <= len(coords) <= XFOIL_PANEL_NODES + 1):
+        return True
+    x = coords[:, 0]
+    le = int(np.argmin(x))
+    if le == 0 or le == len(x) - 1:
+        return True
+    dx = np.diff(x)
+    if not (np.all(dx[:le] <= 0) and np.all(dx[le:] >= 0)):
+        return True
+    ds = np.hypot(dx, np.diff(coords[:, 1]))
+    if ds.min() <= 1e-9:
+        return True
+    if np.max(np.maximum(ds[1:] / ds[:-1], ds[:-1] / ds[1:])) > MAX_SPACING_RATIO:
+        return True
+    return bool(max(ds[le - 1], ds[le]) >= np.median(ds))
 
 
 def extract_aerodynamic_coefficients(stdout: str):
     """Extract coefficients — takes last occurrence (final converged value)."""
+    # The converged values are printed last: walk the tail's lines backwards
+    # and stop as soon as all four are seen (usually within a few lines), so
+    # the first hit per key is its last occurrence. Fall back to a forward
+    # scan of the full output if the tail is missing any coefficient.
     coefficients = {}
-    patterns = {
-        "CL":  r"CL\s*=\s*([-+]?\d*\.?\d+)",
-        "CD":  r"CD\s*=\s*([-+]?\d*\.?\d+)",
-        "CDp": r"CDp\s*=\s*([-+]?\d*\.?\d+)",
-        "Cm":  r"Cm\s*=\s*([-+]?\d*\.?\d+)",
-    }
-    for key, pattern in patterns.items():
-        matches = re.findall(pattern, stdout)
-        if matches:
-            coefficients[key] = float(matches[-1])
+    tail = stdout[-COEFF_TAIL_CHARS:]
+    for line in reversed(tail.splitlines()):
+        for key, value in reversed(_COEFF_RE.findall(line)):
+            coefficients.setdefault(key, float(value))
+        if len(coefficients) == 4:
+            return coefficients
+    if len(tail) < len(stdout):
+        coefficients = {m.group(1): float(m.group(2)) for m in _COEFF_RE.finditer(stdout)}
     return coefficients
 
 
@@ -210,7 +818,7 @@ def parse_bl_dump(bl_file_path: str):
     Returns None if file is missing or cannot be parsed.
     """
     if not os.path.exists(bl_file_path):
-        logger.info(f"BL dump file not found: {bl_file_path}")
+        logger.debug("BL dump file not found: %s", bl_file_path)
         return None
 
     sections      = []
@@ -246,13 +854,13 @@ def parse_bl_dump(bl_file_path: str):
             sections.append(current_block)
 
         if not sections:
-            logger.info("BL parse: no sections found in dump file")
+            logger.debug("BL parse: no sections found in dump file")
             return None
 
         upper_rows = sections[0] if len(sections) > 0 else []
         lower_rows = sections[1] if len(sections) > 1 else []
 
-        logger.info(f"BL parse: {len(upper_rows)} upper pts, {len(lower_rows)} lower pts")
+        logger.debug("BL parse: %d upper pts, %d lower pts", len(upper_rows), len(lower_rows))
 
         def find_transition_x(rows):
             if len(rows) < 4:
@@ -267,7 +875,7 @@ def parse_bl_dump(bl_file_path: str):
         tr_upper = find_transition_x(upper_rows)
         tr_lower = find_transition_x(lower_rows)
 
-        logger.info(f"BL parse: transition upper x={tr_upper}, lower x={tr_lower}")
+        logger.debug("BL parse: transition upper x=%s, lower x=%s", tr_upper, tr_lower)
 
         return {
             "upper":              upper_rows,
@@ -277,55 +885,161 @@ def parse_bl_dump(bl_file_path: str):
         }
 
     except Exception as e:
-        logger.info(f"BL parse error: {e}")
+        logger.info("BL parse error: %s", e)
         return None
 
 
-def run_xfoil_sync(coords_file: str, reynolds: float, alpha: float, work_dir: str):
-    """Run XFOIL with retry strategy. Returns (cp_x, cp_values, coefficients, bl_data)."""
-    coords_filename = "airfoil.dat"
+POLAR_COLUMNS = ("alpha", "CL", "CD", "CDp", "Cm")
+
+
+def parse_polar_file(polar_path: str):
+    """
+    Parse an XFOIL PACC polar file.
+
+    Data rows follow a free-text header and start with the columns
+        alpha   CL   CD   CDp   CM   Top_Xtr   Bot_Xtr
+
+    Returns a dict mapping each name in POLAR_COLUMNS to a contiguous
+    1-D array (empty if the file is missing or holds no converged points).
+    """
+    if not os.path.exists(polar_path):
+        rows = np.empty((0, len(POLAR_COLUMNS)))
+    else:
+        rows = _load_columns(polar_path, len(POLAR_COLUMNS))
+    return {name: np.ascontiguousarray(rows[:, i]) for i, name in enumerate(POLAR_COLUMNS)}
+
+
+def polar_point_count(alpha_start: float, alpha_end: float, alpha_step: float) -> int:
+    """
+    Number of angles ASEQ solves for a sweep. XFOIL rounds the step count to
+    the nearest integer, so do the same rather than compare the raw float
+    ratio, which lands just above a whole number for many decimal steps.
+    """
+    return int(round((alpha_end - alpha_start) / alpha_step)) + 1
+
+
+async def run_xfoil_polar(
+    coords_file: str,
+    reynolds:    float,
+    alpha_start: float,
+    alpha_end:   float,
+    alpha_step:  float,
+    work_dir:    str,
+):
+    """
+    Run a viscous alpha sweep (ASEQ) in a single XFOIL session, so panelling
+    and start-up are paid once and each angle warm-starts the boundary layer
+    from the previous one. Angles that fail to converge are absent from the
+    polar, as in XFOIL's own output. Returns parse_polar_file's dict.
+    """
+    polar_path = os.path.abspath(os.path.join(work_dir, "polar.out"))
+    if os.path.exists(polar_path):
+        os.remove(polar_path)
+
+    rel_dir = os.path.relpath(work_dir, TMP_DIR)
+    script = "\n".join([
+        f"LOAD {os.path.relpath(os.path.abspath(coords_file), TMP_DIR)}",
+        "PANE",
+        "OPER",
+        f"VISC {int(reynolds)}",
+        "ITER 500",
+        "PACC",
+        os.path.join(rel_dir, "polar.out"),
+        "",                      # no polar dump file
+        f"ASEQ {alpha_start} {alpha_end} {alpha_step}",
+        "PACC",
+        "",
+        "QUIT",
+    ]) + "\n"
+
+    proc = await xfoil_pool.acquire()
+    stdout, _ = await XfoilPool.run(proc, script, POLAR_TIMEOUT)
+
+    polar = await to_thread.run_sync(parse_polar_file, polar_path)
+    if not len(polar["alpha"]):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Last 800 chars: %s", stdout[-800:])
+        raise Exception("XFOIL did not converge at any angle in the sweep")
+    logger.info("Polar: %d/%d angles converged", len(polar["alpha"]),
+                int(round((alpha_end - alpha_start) / alpha_step)) + 1)
+    return polar
+
+
+async def run_xfoil(coords_file: str, reynolds: float, alpha: float, work_dir: str,
+                    repanel: bool = True):
+    """
+    Run XFOIL with retry strategy. Returns (cp_x, cp_values, coefficients, bl_data).
+    repanel=False skips PANE on the first attempt only; the smoothed and
+    inviscid fallbacks always re-panel. coords_file is LOADed in place, so
+    callers write it straight into work_dir rather than having it copied.
+    """
+    coords_filename = os.path.relpath(os.path.abspath(coords_file), os.path.abspath(work_dir))
     cp_filename     = "cp_output.txt"
     bl_filename     = "bl_output.txt"
 
-    shutil.copy(coords_file, os.path.join(work_dir, coords_filename))
-
     # Strategy 1: Viscous, clean geometry
     try:
-        logger.info("Attempt 1: VISCOUS mode, clean geometry...")
-        return _run_xfoil_mode(coords_filename, cp_filename, bl_filename, work_dir,
-                               reynolds, alpha, viscous=True, timeout=90, smooth_geometry=False)
+        logger.info("Attempt 1: VISCOUS mode, clean geometry%s...", "" if repanel else " (no PANE)")
+        return await _run_xfoil_mode(coords_filename, cp_filename, bl_filename, work_dir,
+                               reynolds, alpha, viscous=True, timeout=90, smooth_geometry=False,
+                               repanel=repanel)
     except subprocess.TimeoutExpired:
         logger.error("Viscous mode timed out after 90s")
     except Exception as e:
         # Catch ALL xfoil solver failures so we always fall through to next strategy.
         # Previously only caught "convergence"/"no pressure data" — but "No valid
         # aerodynamic coefficients found" was re-raised, skipping strategies 2 & 3.
-        logger.info(f"Strategy 1 failed: {e}")
+        logger.info("Strategy 1 failed: %s", e)
 
-    # Strategy 2: Viscous, smoothed geometry
-    try:
-        logger.info("Attempt 2: VISCOUS mode, smoothed geometry...")
-        return _run_xfoil_mode(coords_filename, cp_filename, bl_filename, work_dir,
-                               reynolds, alpha, viscous=True, timeout=90, smooth_geometry=True)
-    except subprocess.TimeoutExpired:
-        logger.error("Viscous mode with smoothing timed out")
-    except Exception as e:
-        logger.info(f"Strategy 2 failed: {e}")
-
-    # Strategy 3: Inviscid fallback (no BL data)
-    sep = "=" * 70
-    logger.info(sep)
-    logger.warning("FALLING BACK TO INVISCID MODE")
-    logger.info("BL data will NOT be available in inviscid mode")
-    logger.info(sep)
+    def inviscid_run():
+        return _run_xfoil_mode(
+            coords_filename, "cp_inviscid.txt", "bl_inviscid.txt", work_dir,
+            reynolds, alpha, viscous=False, timeout=20, smooth_geometry=False,
+            log_filename="xfoil_inviscid.log",
+        )
+
+    # Strategy 1 failed, so the inviscid fallback is likely to be needed:
+    # if a second solver slot is free, start it now alongside strategy 2. It
+    # shares only the read-only airfoil.dat with strategy 2; its Cp, BL and
+    # log files have their own names, so neither run's pre-run cleanup can
+    # delete the other's output. It is cancelled (and its XFOIL killed) if
+    # strategy 2 succeeds. Under load it runs after strategy 2 instead, so
+    # XFOIL_CONCURRENCY still bounds the number of live solvers.
+    inviscid = None
+    if await try_xfoil_slot():
+        inviscid = asyncio.create_task(inviscid_run())
+        # A done callback also fires if the task is cancelled before it starts.
+        inviscid.add_done_callback(lambda _: xfoil_semaphore.release())
     try:
-        return _run_xfoil_mode(coords_filename, cp_filename, bl_filename, work_dir,
-                               reynolds, alpha, viscous=False, timeout=20, smooth_geometry=False)
-    except Exception as e:
-        raise Exception(f"All strategies failed. Last error: {e}")
+        # Strategy 2: Viscous, smoothed geometry
+        try:
+            logger.info("Attempt 2: VISCOUS mode, smoothed geometry...")
+            return await _run_xfoil_mode(coords_filename, cp_filename, bl_filename, work_dir,
+                                   reynolds, alpha, viscous=True, timeout=90, smooth_geometry=True)
+        except subprocess.TimeoutExpired:
+            logger.error("Viscous mode with smoothing timed out")
+        except Exception as e:
+            logger.info("Strategy 2 failed: %s", e)
+
+        # Strategy 3: Inviscid fallback (no BL data)
+        sep = "=" * 70
+        logger.info(sep)
+        logger.warning("FALLING BACK TO INVISCID MODE")
+        logger.info("BL data will NOT be available in inviscid mode")
+        logger.info(sep)
+        try:
+            return await (inviscid if inviscid is not None else inviscid_run())
+        except Exception as e:
+            raise Exception(f"All strategies failed. Last error: {e}")
+    finally:
+        if inviscid is not None:
+            inviscid.cancel()
+            # Always retrieve the outcome, so a failure of an unused
+            # speculative run is not reported as never retrieved.
+            await asyncio.gather(inviscid, return_exceptions=True)
 
 
-def _run_xfoil_mode(
+async def _run_xfoil_mode(
     coords_filename: str,
     cp_filename:     str,
     bl_filename:     str,
@@ -335,11 +1049,19 @@ def _run_xfoil_mode(
     viscous:         bool,
     timeout:         int,
     smooth_geometry: bool = False,
+    repanel:         bool = True,
+    log_filename:    str  = "xfoil_output.log",
 ):
     cp_out_path = os.path.abspath(os.path.join(work_dir, cp_filename))
     bl_out_path = os.path.abspath(os.path.join(work_dir, bl_filename))
-    script_path = os.path.abspath(os.path.join(work_dir, "xfoil_script.txt"))
-    log_path    = os.path.abspath(os.path.join(work_dir, "xfoil_output.log"))
+    log_path    = os.path.abspath(os.path.join(work_dir, log_filename))
+
+    # Pooled XFOIL processes run with cwd=TMP_DIR, so every file the script
+    # names is given relative to that rather than to work_dir.
+    rel_dir = os.path.relpath(work_dir, TMP_DIR)
+    coords_filename = os.path.join(rel_dir, coords_filename)
+    cp_filename     = os.path.join(rel_dir, cp_filename)
+    bl_filename     = os.path.join(rel_dir, bl_filename)
 
     for path in [cp_out_path, bl_out_path, log_path]:
         if os.path.exists(path):
@@ -350,7 +1072,8 @@ def _run_xfoil_mode(
 
     script_lines = []
     script_lines.append(f"LOAD {coords_filename}")
-    script_lines.append("PANE")
+    if repanel or smooth_geometry:
+        script_lines.append("PANE")
 
     if smooth_geometry:
         script_lines.append("GDES")
@@ -371,152 +1094,172 @@ def _run_xfoil_mode(
 
     script_lines.append("")
     script_lines.append("QUIT")
-
-    with open(script_path, "w", newline="\n") as f:
-        f.write("\n".join(script_lines))
+    script = "\n".join(script_lines) + "\n"
 
     # Fixed f-strings: extract expressions to variables first
     mode = "VISCOUS" if viscous else "INVISCID"
     smooth_str = "+ SMOOTH" if smooth_geometry else ""
     sep70 = "=" * 70
-    logger.info("\n" + sep70)
-    logger.info(f"XFOIL SCRIPT ({mode}{smooth_str})")
-    logger.info(sep70)
-    for i, line in enumerate(script_lines):
-        logger.info(f"  {i+1:2d}: {repr(line)}")
-    logger.info(sep70)
-
-    proc = None
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("\n%s", sep70)
+        logger.debug("XFOIL SCRIPT (%s%s)", mode, smooth_str)
+        logger.debug(sep70)
+        for i, line in enumerate(script_lines):
+            logger.debug("  %2d: %r", i + 1, line)
+        logger.debug(sep70)
+
+    proc = await xfoil_pool.acquire()
+
+    # run() only returns once XFOIL has exited and its output files are
+    # closed, so the CP/BL files can be read immediately.
+    stdout, stderr = await XfoilPool.run(proc, script, timeout)
+
+    # Log writing and output parsing are blocking; keep them off the loop.
+    return await to_thread.run_sync(
+        _collect_xfoil_results, stdout, stderr, proc.returncode,
+        log_path, cp_out_path, bl_out_path, reynolds, alpha, viscous,
+    )
+
+
+def _write_run_log(log_path, stdout, stderr, returncode, reynolds, alpha, viscous):
+    mode = "VISCOUS" if viscous else "INVISCID"
+    with open(log_path, "w", newline="\n") as f:
+        f.write("=" * 70 + "\n")
+        f.write(f"XFOIL LOG ({mode})\n")
+        f.write("=" * 70 + "\n\n")
+        f.write(f"Reynolds:    {reynolds}\n")
+        f.write(f"Alpha:       {alpha}\n")
+        f.write(f"Viscous:     {viscous}\n")
+        f.write(f"Return code: {returncode}\n\n")
+        f.write("STDOUT\n" + "=" * 70 + "\n")
+        f.write(stdout)
+        f.write("\n\nSTDERR\n" + "=" * 70 + "\n")
+        f.write(stderr)
+
+
+def _collect_xfoil_results(
+    stdout:      str,
+    stderr:      str,
+    returncode:  int,
+    log_path:    str,
+    cp_out_path: str,
+    bl_out_path: str,
+    reynolds:    float,
+    alpha:       float,
+    viscous:     bool,
+):
+    """
+    Validate a finished XFOIL run and parse its outputs.
+    Returns (cp_x, cp_values, coefficients, bl_data); raises on failure.
+
+    The per-run log file is only written when the run fails, exits non-zero
+    or DEBUG logging is on; healthy runs skip that write entirely.
+    """
+    log_args = (log_path, stdout, stderr, returncode, reynolds, alpha, viscous)
+    log_written = returncode != 0 or logger.isEnabledFor(logging.DEBUG)
+    if log_written:
+        _write_run_log(*log_args)
     try:
-        with open(script_path, "r") as script_file:
-            proc = subprocess.Popen(
-                [XFOIL_EXE],
-                stdin=script_file,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=work_dir,
-            )
+        return _parse_xfoil_run(stdout, returncode, cp_out_path, bl_out_path,
+                                reynolds, alpha, viscous)
+    except Exception:
+        if not log_written:
+            _write_run_log(*log_args)
+        raise
 
-        stdout, stderr = proc.communicate(timeout=timeout)
-        time.sleep(0.3)
-
-        with open(log_path, "w", newline="\n") as f:
-            f.write("=" * 70 + "\n")
-            f.write(f"XFOIL LOG ({mode})\n")
-            f.write("=" * 70 + "\n\n")
-            f.write(f"Reynolds:    {reynolds}\n")
-            f.write(f"Alpha:       {alpha}\n")
-            f.write(f"Viscous:     {viscous}\n")
-            f.write(f"Return code: {proc.returncode}\n\n")
-            f.write("STDOUT\n" + "=" * 70 + "\n")
-            f.write(stdout)
-            f.write("\n\nSTDERR\n" + "=" * 70 + "\n")
-            f.write(stderr)
-
-        logger.info(f"Return code: {proc.returncode}")
-        if proc.returncode != 0:
-            logger.warning(f"Non-zero exit code: {proc.returncode}")
-
-        panel_matches = re.findall(r"Number of panel nodes\s+(\d+)", stdout)
-        if panel_matches:
-            panel_count = int(panel_matches[-1])
-            logger.info(f"Detected: {panel_count} panels")
-            if panel_count >= 140:
-                logger.info(f"Panel count is sufficient for accurate results")
-            else:
-                logger.warning(f"Low panel count ({panel_count})")
-        else:
-            logger.warning(f"Could not detect panel count")
-            logger.info(f"   XFOIL may have crashed early")
 
-        if viscous:
-            visc_confirmed = any(ind in stdout for ind in ["Re =", "VISCAL", "Cm ="])
-            if visc_confirmed and ("CDp" in stdout or "CD =" in stdout):
-                logger.info("Viscous mode confirmed")
-            else:
-                logger.warning("Viscous mode requested but may not have converged")
-                logger.info("   Results may be inviscid or unconverged")
+def _parse_xfoil_run(stdout, returncode, cp_out_path, bl_out_path, reynolds, alpha, viscous):
+    mode = "VISCOUS" if viscous else "INVISCID"
 
-        convergence_failed = (
-            "VISCAL:  Convergence failed" in stdout or
-            "not converged" in stdout.lower() or
-            "unconverged" in stdout.lower()
-        )
-        if convergence_failed:
-            raise Exception(f"Viscous convergence failed at alpha={alpha}")
-
-        if not os.path.exists(cp_out_path):
-            logger.info(f"Last 800 chars: {stdout[-800:]}")
-            raise Exception(f"{mode} did not generate CP output file")
-
-        coefficients = extract_aerodynamic_coefficients(stdout)
-        if not coefficients or "CL" not in coefficients:
-            logger.error(f"No coefficients extracted from XFOIL output")
-            logger.info(f"\nChecking if ALFA {alpha} was processed:")
-            alpha_patterns = [
-                f"alfa = {alpha:.3f}",
-                f"ALFA   {alpha:.2f}",
-                f"a = {alpha:.2f}",
-            ]
-            found_alpha = any(pattern.lower() in stdout.lower() for pattern in alpha_patterns)
-            if found_alpha:
-                logger.info(f"  Alpha command was processed")
-            else:
-                logger.info(f"  WARNING: Could not verify alpha={alpha} was calculated!")
-                logger.info(f"  This suggests XFOIL may have used cached/stale results")
-            raise Exception(f"No valid aerodynamic coefficients found for alpha={alpha}")
+    logger.debug("Return code: %s", returncode)
+    if returncode != 0:
+        logger.warning("Non-zero exit code: %s", returncode)
+
+    # PANE reports the node count before OPER starts iterating, so look in
+    # the head of the output first rather than scanning every iteration line.
+    panel_matches = (_PANEL_NODES_RE.findall(stdout[:PANEL_HEAD_CHARS])
+                     or _PANEL_NODES_RE.findall(stdout[PANEL_HEAD_CHARS:]))
+    if panel_matches:
+        panel_count = int(panel_matches[-1])
+        logger.debug("Detected: %d panels", panel_count)
+        if panel_count >= 140:
+            logger.debug("Panel count is sufficient for accurate results")
+        else:
+            logger.warning("Low panel count (%d)", panel_count)
+    else:
+        logger.warning("Could not detect panel count")
+        logger.info("   XFOIL may have crashed early")
 
-        cp_x, cp_values = [], []
-        with open(cp_out_path, "r") as f:
-            for line in f:
-                clean = line.strip()
-                if not clean or any(c.isalpha() for c in clean):
-                    continue
-                parts = clean.split()
-                if len(parts) >= 2:
-                    try:
-                        cp_x.append(float(parts[0]))
-                        cp_values.append(float(parts[1]))
-                    except ValueError:
-                        continue
+    if viscous:
+        visc_confirmed = any(ind in stdout for ind in ["Re =", "VISCAL", "Cm ="])
+        if visc_confirmed and ("CDp" in stdout or "CD =" in stdout):
+            logger.debug("Viscous mode confirmed")
+        else:
+            logger.warning("Viscous mode requested but may not have converged")
+            logger.info("   Results may be inviscid or unconverged")
+
+    stdout_l = stdout.lower()
+    convergence_failed = (
+        "VISCAL:  Convergence failed" in stdout or
+        "not converged" in stdout_l or
+        "unconverged" in stdout_l
+    )
+    if convergence_failed:
+        raise Exception(f"Viscous convergence failed at alpha={alpha}")
+
+    if not os.path.exists(cp_out_path):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Last 800 chars: %s", stdout[-800:])
+        raise Exception(f"{mode} did not generate CP output file")
+
+    coefficients = extract_aerodynamic_coefficients(stdout)
+    if not coefficients or "CL" not in coefficients:
+        logger.error("No coefficients extracted from XFOIL output")
+        logger.info("Checking if ALFA %s was processed:", alpha)
+        alpha_patterns = [
+            f"alfa = {alpha:.3f}",
+            f"alfa   {alpha:.2f}",
+            f"a = {alpha:.2f}",
+        ]
+        found_alpha = any(pattern in stdout_l for pattern in alpha_patterns)
+        if found_alpha:
+            logger.info("  Alpha command was processed")
+        else:
+            logger.info("  WARNING: Could not verify alpha=%s was calculated!", alpha)
+            logger.info("  This suggests XFOIL may have used cached/stale results")
+        raise Exception(f"No valid aerodynamic coefficients found for alpha={alpha}")
 
-        if not cp_x:
-            raise Exception("No pressure data")
+    cp = _load_xy(cp_out_path)
+    if not len(cp):
+        raise Exception("No pressure data")
+    # Columns of an (N, 2) array are strided views; orjson needs them contiguous.
+    cp_x, cp_values = np.ascontiguousarray(cp[:, 0]), np.ascontiguousarray(cp[:, 1])
 
-        bl_data = None
-        if viscous:
-            bl_data = parse_bl_dump(bl_out_path)
-            status = f"upper={len(bl_data['upper'])}, lower={len(bl_data['lower'])}" if bl_data else "not available"
-            logger.info(f"BL data: {status}")
+    bl_data = None
+    if viscous:
+        bl_data = parse_bl_dump(bl_out_path)
+        if bl_data:
+            logger.debug("BL data: upper=%d, lower=%d", len(bl_data["upper"]), len(bl_data["lower"]))
+        else:
+            logger.debug("BL data: not available")
 
-        cl = coefficients.get("CL", 0)
-        cd = coefficients.get("CD", 0.0001)
-        ld = cl / cd if cd > 0 else 0
+    cl = coefficients.get("CL", 0)
+    cd = coefficients.get("CD", 0.0001)
+    ld = cl / cd if cd > 0 else 0
 
-        logger.info(f"CL={cl:.4f}  CD={cd:.6f}  L/D={ld:.1f}  CP_pts={len(cp_x)}")
+    logger.info("CL=%.4f  CD=%.6f  L/D=%.1f  CP_pts=%d", cl, cd, ld, len(cp_x))
 
-        if cd < 0.005 and viscous and reynolds > 100000:
-            logger.warning(f"CD={cd:.6f} seems low (expected 0.007-0.012)")
-        if ld > 150:
-            logger.warning(f"L/D={ld:.0f} unusually high")
+    if cd < 0.005 and viscous and reynolds > 100000:
+        logger.warning("CD=%.6f seems low (expected 0.007-0.012)", cd)
+    if ld > 150:
+        logger.warning("L/D=%.0f unusually high", ld)
 
-        coefficients["mode"] = "viscous" if viscous else "inviscid"
-        if not viscous:
-            coefficients["warning"] = "INVISCID MODE - CD is unrealistically low"
+    coefficients["mode"] = "viscous" if viscous else "inviscid"
+    if not viscous:
+        coefficients["warning"] = "INVISCID MODE - CD is unrealistically low"
 
-        return cp_x, cp_values, coefficients, bl_data
+    return cp_x, cp_values, coefficients, bl_data
 
-    except subprocess.TimeoutExpired:
-        if proc:
-            proc.kill()
-            try:
-                proc.wait(timeout=2)
-            except Exception:
-                pass
-        raise
-    except Exception as e:
-        raise e
 
 
 @app.get("/")
@@ -529,17 +1272,91 @@ async def root(request: Request):
 @app.get("/health")
 @limiter.limit("20/minute")
 async def health(request: Request):
-    xfoil_exists = os.path.exists(XFOIL_EXE) or (
-        not IS_WINDOWS and os.system(f"which {XFOIL_EXE} >/dev/null 2>&1") == 0
-    )
+    xfoil_exists = XFOIL_RESOLVED is not None
     return {
         "status":       "healthy" if xfoil_exists else "degraded",
-        "xfoil_path":   XFOIL_EXE,
+        "xfoil_path":   XFOIL_RESOLVED or XFOIL_EXE,
         "xfoil_exists": xfoil_exists,
-        "platform":     platform.system(),
+        "platform":     PLATFORM_NAME,
     }
 
 
+def read_upload(src) -> str:
+    """
+    Read an upload's spooled file in UPLOAD_CHUNK pieces, enforcing
+    MAX_FILE_SIZE as it goes, and return the body decoded as text.
+    Gzip-compressed bodies are recognised by their magic bytes and inflated.
+    """
+    buf = io.BytesIO()
+    while chunk := src.read(UPLOAD_CHUNK):
+        if buf.tell() + len(chunk) > MAX_FILE_SIZE:
+            # Same status as the Content-Length check in check_upload.
+            raise HTTPException(status_code=413,
+                detail=f"File too large (max {MAX_FILE_SIZE/(1024*1024)}MB)")
+        buf.write(chunk)
+    body = buf.getvalue()
+    if body.startswith(GZIP_MAGIC):
+        body = gunzip_upload(body)
+    return body.decode("utf-8", "replace")
+
+
+def gunzip_upload(body: bytes) -> bytes:
+    """
+    Inflate a gzip-compressed upload. The inflated size is capped at
+    MAX_FILE_SIZE as well, so a small compressed body cannot expand without
+    bound.
+    """
+    inflater = zlib.decompressobj(wbits=31)   # gzip container
+    try:
+        data = inflater.decompress(body, MAX_FILE_SIZE + 1)
+    except zlib.error:
+        raise HTTPException(status_code=400, detail="Corrupt gzip upload")
+    if len(data) > MAX_FILE_SIZE:
+        raise HTTPException(status_code=413,
+            detail=f"File too large (max {MAX_FILE_SIZE/(1024*1024)}MB)")
+    if not inflater.eof:
+        raise HTTPException(status_code=400, detail="Corrupt gzip upload")
+    return data
+
+
+def load_airfoil_upload(src):
+    """
+    Blocking half of the upload path: read and parse the upload in memory
+    and validate it. Returns (coords, fixes) from parse_dat_text.
+    """
+    raw_coords, parser_fixes = parse_dat_text(read_upload(src))
+    if len(raw_coords) > MAX_POINTS:
+        raise HTTPException(status_code=400, detail=f"Too many points (max {MAX_POINTS})")
+    validate_coords(raw_coords)
+
+    logger.info("Parsed: %d points, fixes: %s", len(raw_coords), parser_fixes)
+    return raw_coords, parser_fixes
+
+
+def write_airfoil_dat(fix_path: str, coords):
+    """Write the cleaned Selig file XFOIL loads."""
+    np.savetxt(fix_path, coords, fmt="  %.6f  %.6f", header="AIRFOIL", comments="")
+
+
+def prepare_airfoil_files(src, fix_path: str):
+    """load_airfoil_upload, then write_airfoil_dat; returns (coords, fixes)."""
+    raw_coords, parser_fixes = load_airfoil_upload(src)
+    write_airfoil_dat(fix_path, raw_coords)
+    return raw_coords, parser_fixes
+
+
+def check_upload(file: UploadFile, reynolds: float):
+    """Request checks shared by every upload endpoint; raises HTTPException."""
+    if not (MIN_REYNOLDS <= reynolds <= MAX_REYNOLDS):
+        raise HTTPException(status_code=400,
+            detail=f"Reynolds must be {MIN_REYNOLDS:,.0f} to {MAX_REYNOLDS:,.0f}")
+    if not file.filename.endswith(".dat"):
+        raise HTTPException(status_code=400, detail="Only .dat files accepted")
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise HTTPException(status_code=413,
+            detail=f"File too large (max {MAX_FILE_SIZE/(1024*1024)}MB)")
+
+
 @app.post("/upload_airfoil/")
 @limiter.limit("5/minute")
 async def upload_airfoil(
@@ -548,50 +1365,44 @@ async def upload_airfoil(
     reynolds: float = Form(...),
     alpha:    float = Form(...),
 ):
-    if not (MIN_REYNOLDS <= reynolds <= MAX_REYNOLDS):
-        raise HTTPException(status_code=400,
-            detail=f"Reynolds must be {MIN_REYNOLDS:,.0f} to {MAX_REYNOLDS:,.0f}")
+    check_upload(file, reynolds)
     if not (MIN_ALPHA <= alpha <= MAX_ALPHA):
         raise HTTPException(status_code=400,
             detail=f"Alpha must be {MIN_ALPHA} to {MAX_ALPHA} degrees")
-    if not file.filename.endswith(".dat"):
-        raise HTTPException(status_code=400, detail="Only .dat files accepted")
 
-    run_id   = str(uuid.uuid4())[:8]
-    work_dir = os.path.join(TMP_DIR, f"run_{run_id}")
-    os.makedirs(work_dir, exist_ok=True)
+    # A queue pop (or a single mkdir on fallback): cheaper inline than a
+    # worker-thread round trip.
+    work_dir = work_dirs.acquire()
 
-    raw_path = os.path.join(work_dir, "raw.dat")
-    fix_path = os.path.join(work_dir, "airfoil_fixed.dat")
+    fix_path = os.path.join(work_dir, "airfoil.dat")
 
-    # Fixed f-string: was logger.info(f"\n{"="*60}\n...")
     sep60 = "=" * 60
-    logger.info(f"\n{sep60}\nNEW REQUEST: {file.filename}\nPlatform: {platform.system()}\n{sep60}")
+    logger.info("\n%s\nNEW REQUEST: %s\nPlatform: %s\n%s", sep60, file.filename, PLATFORM_NAME, sep60)
 
     try:
-        content = await file.read()
-        if len(content) > MAX_FILE_SIZE:
-            raise HTTPException(status_code=400,
-                detail=f"File too large (max {MAX_FILE_SIZE/(1024*1024)}MB)")
-
-        with open(raw_path, "wb") as f:
-            f.write(content)
-
-        raw_coords, parser_fixes = parse_dat_file(raw_path)
-        if len(raw_coords) > MAX_POINTS:
-            raise HTTPException(status_code=400, detail=f"Too many points (max {MAX_POINTS})")
-
-        logger.info(f"Parsed: {len(raw_coords)} points, fixes: {parser_fixes}")
-
-        with open(fix_path, "w") as f:
-            f.write("AIRFOIL\n")
-            for x, y in raw_coords:
-                f.write(f"  {x:.6f}  {y:.6f}\n")
-
-        async with xfoil_semaphore:
-            cp_x, cp_values, coefficients, bl_data = await to_thread.run_sync(
-                run_xfoil_sync, fix_path, reynolds, alpha, work_dir
-            )
+        raw_coords, parser_fixes = await to_thread.run_sync(load_airfoil_upload, file.file)
+
+        cache_key = ResultCache.key(raw_coords, reynolds, alpha)
+        cached = result_cache.get(cache_key)
+        if cached is None and result_cache.disk_dir:
+            cached = await to_thread.run_sync(result_cache.load, cache_key)
+            if cached is not None:
+                result_cache.put(cache_key, cached)
+        if cached is not None:
+            logger.info("Result cache hit")
+            cp_x, cp_values, coefficients, bl_data = cached
+        else:
+            # Only a solve needs the file on disk; cache hits never write it.
+            await to_thread.run_sync(write_airfoil_dat, fix_path, raw_coords)
+            async with xfoil_slot():
+                cp_x, cp_values, coefficients, bl_data = await run_xfoil(
+                    fix_path, reynolds, alpha, work_dir, needs_repanel(raw_coords),
+                )
+            result = (cp_x, cp_values, coefficients, bl_data)
+            if ResultCache.cacheable(result):
+                result_cache.put(cache_key, result)
+                if result_cache.disk_dir:
+                    await to_thread.run_sync(result_cache.store, cache_key, result)
 
         bl_response = None
         if bl_data is not None:
@@ -602,33 +1413,99 @@ async def upload_airfoil(
                 "transition_lower_x": bl_data["transition_lower_x"],
             }
 
-        return {
+        # Returned as a Response instance so FastAPI skips jsonable_encoder
+        # and hands the payload straight to orjson.
+        return ORJSONResponse({
             "success":       True,
-            "coords_before": raw_coords,
-            "coords_after":  raw_coords,
+            "coords":        raw_coords,
             "num_points":    len(raw_coords),
             "cp_x":          cp_x,
             "cp_values":     cp_values,
             "coefficients":  coefficients,
             "bl_data":       bl_response,
             "parser_fixes":  parser_fixes,
-        }
+        })
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"{str(e)}")
+        logger.error("%s", e)
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        try:
-            if os.path.exists(work_dir):
-                time.sleep(0.2)
-                shutil.rmtree(work_dir, ignore_errors=True)
-        except Exception:
-            pass
+        await to_thread.run_sync(work_dirs.release, work_dir)
+
+
+@app.post("/upload_airfoil_polar/")
+@limiter.limit("5/minute")
+async def upload_airfoil_polar(
+    request:     Request,
+    file:        UploadFile,
+    reynolds:    float = Form(...),
+    alpha_start: float = Form(...),
+    alpha_end:   float = Form(...),
+    alpha_step:  float = Form(...),
+):
+    check_upload(file, reynolds)
+    if not (MIN_ALPHA <= alpha_start <= alpha_end <= MAX_ALPHA):
+        raise HTTPException(status_code=400,
+            detail=f"Alpha range must lie within {MIN_ALPHA} to {MAX_ALPHA} degrees, start <= end")
+    if alpha_step <= 0:
+        raise HTTPException(status_code=400, detail="Alpha step must be positive")
+    if polar_point_count(alpha_start, alpha_end, alpha_step) > MAX_POLAR_POINTS:
+        raise HTTPException(status_code=400,
+            detail=f"Too many angles in sweep (max {MAX_POLAR_POINTS})")
+
+    work_dir = work_dirs.acquire()
+    fix_path = os.path.join(work_dir, "airfoil.dat")
+
+    logger.info("NEW POLAR REQUEST: %s  alpha %s..%s step %s",
+                file.filename, alpha_start, alpha_end, alpha_step)
+
+    try:
+        raw_coords, parser_fixes = await to_thread.run_sync(
+            prepare_airfoil_files, file.file, fix_path
+        )
+
+        async with xfoil_slot():
+            polar = await run_xfoil_polar(
+                fix_path, reynolds, alpha_start, alpha_end, alpha_step, work_dir,
+            )
+
+        return ORJSONResponse({
+            "success":      True,
+            "coords":       raw_coords,
+            "num_points":   len(raw_coords),
+            "reynolds":     reynolds,
+            "polar":        polar,
+            "parser_fixes": parser_fixes,
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("%s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await to_thread.run_sync(work_dirs.release, work_dir)
 
 
 if __name__ == "__main__":
     import uvicorn
-    port = int(os.getenv("PORT", "8000"))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    port    = int(os.getenv("PORT", "8000"))
+    reload  = os.getenv("RELOAD", "false").lower() == "true"
+    workers = 1 if reload else int(os.getenv("WEB_WORKERS", "1"))
+    # loop/http "auto" pick uvloop + httptools when uvicorn[standard] is
+    # installed and fall back to asyncio + h11 (e.g. on Windows).
+    # Each worker has its own XFOIL pool and semaphore; rate limits are only
+    # shared between workers when RATE_LIMIT_STORAGE_URI is a shared store.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="auto",
+        http="auto",
+        workers=workers,
+        reload=reload,
+        limit_concurrency=int(os.getenv("LIMIT_CONCURRENCY", "1024")),
+        backlog=2048,
+    )
\ No newline at end of file
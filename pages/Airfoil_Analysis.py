@@ -5,11 +5,19 @@ import plotly.graph_objects as go
 import numpy as np
 import os
 import time
+import threading
+import random
+import hashlib
+import gzip
 import io
 import base64
 import json
+import orjson
 import streamlit.components.v1 as components
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from db_utils import increment_analysis_count
+from http_utils import get_http_session, probe_backend
 
 
 # ── Flow Visualization Helpers ───────────────────────────────────────────────
@@ -569,6 +577,79 @@ def build_flow_animation(sl_x, sl_y, speed_grid, x_arr, y_arr, coords, alpha_deg
     return fig
 
 
+# ── Result Figures ───────────────────────────────────────────────────────────
+# Cached as resources: every widget interaction reruns the page, and the
+# figures only change when the analysed geometry or conditions do.
+
+# Zero reference lines and grid, as layout pieces so each figure is built
+# in one constructor call.
+ZERO_HLINE = dict(type="line", xref="x domain", x0=0, x1=1, yref="y", y0=0, y1=0,
+                  line=dict(color="gray", dash="dash"), opacity=0.3)
+ZERO_VLINE = dict(type="line", xref="x", x0=0, x1=0, yref="y domain", y0=0, y1=1,
+                  line=dict(color="gray", dash="dash"), opacity=0.3)
+GRID_AXIS = dict(showgrid=True, gridcolor='lightgray')
+
+@st.cache_resource(max_entries=32)
+def build_geometry_fig(coords, title, height=400):
+    # float32 is ample for plotting and halves what Plotly ships to the browser.
+    xy = np.asarray(coords, dtype=np.float32)
+    return go.Figure(
+        data=[go.Scatter(
+            x=xy[:, 0], y=xy[:, 1],
+            mode='lines', name='Airfoil',
+            line=dict(color='#667eea', width=3),
+            fill='toself', fillcolor='rgba(102, 126, 234, 0.2)',
+            hovertemplate='x: %{x:.4f}<br>y: %{y:.4f}<extra></extra>'
+        )],
+        layout=dict(
+            title=title,
+            xaxis=dict(title="x/c", **GRID_AXIS),
+            yaxis=dict(title="y/c", scaleanchor="x", scaleratio=1, **GRID_AXIS),
+            shapes=[ZERO_HLINE, ZERO_VLINE],
+            height=height, hovermode='closest',
+            plot_bgcolor='white',
+        ),
+    )
+
+
+@st.cache_resource(max_entries=32)
+def build_cp_fig(cp_x, cp_values, reynolds, alpha):
+    cp_x = np.asarray(cp_x, dtype=np.float32)
+    cp_values = np.asarray(cp_values, dtype=np.float32)
+    mid_idx = len(cp_x) // 2
+    return go.Figure(
+        data=[
+            go.Scatter(
+                x=cp_x[:mid_idx], y=cp_values[:mid_idx],
+                mode='lines', name='Upper surface',
+                line=dict(color='#3b82f6', width=3),
+                hovertemplate='x/c: %{x:.4f}<br>Cp: %{y:.4f}<extra></extra>'
+            ),
+            go.Scatter(
+                x=cp_x[mid_idx:], y=cp_values[mid_idx:],
+                mode='lines', name='Lower surface',
+                line=dict(color='#ef4444', width=3),
+                hovertemplate='x/c: %{x:.4f}<br>Cp: %{y:.4f}<extra></extra>'
+            ),
+        ],
+        layout=dict(
+            title=f"Re = {reynolds:,.0f}, α = {alpha}°",
+            xaxis=dict(title="x/c", **GRID_AXIS),
+            yaxis=dict(title="Cp", autorange='reversed', **GRID_AXIS),
+            shapes=[ZERO_HLINE],
+            height=400, hovermode='closest',
+            plot_bgcolor='white',
+        ),
+    )
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def cp_csv_bytes(cp_x, cp_values) -> bytes:
+    # repr() gives the same shortest round-trip floats pandas writes
+    rows = (f"{x!r},{cp!r}" for x, cp in zip(np.asarray(cp_x).tolist(), np.asarray(cp_values).tolist()))
+    return ("x,Cp\n" + "".join(row + "\n" for row in rows)).encode()
+
+
 st.set_page_config(page_title="Airfoil Analysis - AeroLab", layout="wide", page_icon="✈️",
                    initial_sidebar_state="collapsed")
 
@@ -590,6 +671,9 @@ st.markdown("""
             letter-spacing: 0.05em;
             margin-bottom: 0.2rem;
         }
+        .param-label.spaced {
+            margin-top: 1.5rem;
+        }
         .panel-title {
             font-size: 1.15rem;
             font-weight: 700;
@@ -616,17 +700,86 @@ st.markdown("""
 BACKEND_URL = "https://aerolab-backend.onrender.com"
 IS_LOCAL = os.environ.get("LOCAL_DEV", "false").lower() == "true"
 
+@st.cache_resource
+def get_background_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="aerolab-bg")
+
+def _ping_backend(session: requests.Session, backend_url: str) -> None:
+    try:
+        session.get(f"{backend_url}/health", timeout=5)
+    except requests.exceptions.RequestException:
+        pass
+
+def warm_backend(backend_url: str, interval: float = 300.0) -> None:
+    """
+    Fire-and-forget /health ping (at most every `interval` seconds per
+    session), so a spun-down backend starts waking and the pooled connection
+    is opened while the user is still choosing parameters.
+    """
+    last = st.session_state.get('warmed_backend')
+    now = time.monotonic()
+    if last and last[0] == backend_url and now - last[1] < interval:
+        return
+    st.session_state.warmed_backend = (backend_url, now)
+    get_background_executor().submit(_ping_backend, get_http_session(), backend_url)
+
+# Admission window for user runs across all sessions of this server: at
+# most SUBMIT_LIMIT runs may start contacting the backend per window. It
+# counts runs, not requests. A batch or a chunked sweep is one run but can
+# send many requests, so this does not keep the server under the backend's
+# per-IP request limit; post_with_retries handles those 429s via Retry-After.
+SUBMIT_WINDOW_S = 60.0
+SUBMIT_LIMIT = 3
+
+@st.cache_resource
+def get_submission_window() -> tuple:
+    return deque(), threading.Lock()
+
+def admit_submission(window_s: float = SUBMIT_WINDOW_S, limit: int = SUBMIT_LIMIT) -> float:
+    """
+    Sliding-window admission check. Records the run and returns 0 if fewer
+    than `limit` runs started in the last `window_s` seconds; otherwise
+    returns how many seconds until the oldest one leaves the window.
+    """
+    recent, lock = get_submission_window()
+    now = time.monotonic()
+    with lock:
+        while recent and now - recent[0] >= window_s:
+            recent.popleft()
+        if len(recent) >= limit:
+            return window_s - (now - recent[0])
+        recent.append(now)
+    return 0.0
+
+class SubmissionThrottled(Exception):
+    """Raised when the admission window is full; wait_s is the cool-down."""
+    def __init__(self, wait_s: float):
+        super().__init__(f"The solver is busy with other runs. Cool down {int(wait_s) + 1}s and try again.")
+        self.wait_s = wait_s
+
+class RunAdmission:
+    """
+    Admission ticket for one user run. The run is charged against the window
+    once, just before its first request actually reaches the backend, so
+    cache hits and files rejected locally never use up the budget. Later
+    requests of the same run are not counted.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._charged = False
+
+    def charge(self) -> None:
+        with self._lock:
+            if self._charged:
+                return
+            wait_s = admit_submission()
+            if wait_s > 0:
+                raise SubmissionThrottled(wait_s)
+            self._charged = True
+
 @st.cache_data(ttl=60, show_spinner=False)
 def check_backend() -> str:
-    try:
-        r = requests.get(f"{BACKEND_URL}/health", timeout=8)
-        if "suspended" in r.text.lower() or "service has been suspended" in r.text.lower():
-            return "suspended"
-        return "online" if r.status_code == 200 else "offline"
-    except requests.exceptions.Timeout:
-        return "offline"
-    except Exception:
-        return "offline"
+    return probe_backend(BACKEND_URL)
 
 backend_status = "online" if IS_LOCAL else check_backend()
 
@@ -671,39 +824,163 @@ if 'batch_results' not in st.session_state:
     st.session_state.batch_results = None
 if 'batch_params' not in st.session_state:
     st.session_state.batch_params = None
+if 'file_digests' not in st.session_state:
+    st.session_state.file_digests = {}
 
-@st.cache_data(ttl=3600, show_spinner=False, max_entries=50)
-def run_xfoil_analysis(file_content: bytes, filename: str, reynolds: float, alpha: float, backend_url: str):
-    url = f"{backend_url}/upload_airfoil/"
-    files = {"file": (filename, file_content, "text/plain")}
-    data = {"reynolds": reynolds, "alpha": alpha}
-    max_retries = 3
-    retry_delay = 5
+def backoff_delay(attempt: int, base: float = 1.0, jitter: float = 0.5, max_delay: float = 30.0) -> float:
+    """Exponential backoff with random jitter, so retrying clients spread out."""
+    return min(base * (2 ** attempt) * (1 + random.random() * jitter), max_delay)
+
+def retry_after_delay(response: requests.Response, attempt: int, max_delay: float = 30.0) -> float:
+    """Honour a numeric Retry-After header (capped), else fall back to backoff."""
+    try:
+        delay = float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        delay = -1.0  # absent, or an HTTP-date
+    if 0 <= delay:
+        return min(delay, max_delay)
+    return backoff_delay(attempt, max_delay=max_delay)
+
+def with_result_arrays(result: dict) -> dict:
+    """
+    Convert a backend result's coordinate and Cp lists to float arrays once,
+    so cache hits and page reruns reuse them instead of rebuilding them.
+    """
+    result["coords"] = np.asarray(result["coords"], dtype=np.float64).reshape(-1, 2)
+    result["cp_x"] = np.asarray(result.get("cp_x") or [], dtype=np.float64)
+    result["cp_values"] = np.asarray(result.get("cp_values") or [], dtype=np.float64)
+    return result
+
+REYNOLDS_PRESETS = (
+    ("Custom", 500_000),
+    ("Model Aircraft (50k)", 50_000),
+    ("Small UAV (100k)", 100_000),
+    ("Light Aircraft (500k)", 500_000),
+    ("Glider (1M)", 1_000_000),
+    ("Small Plane (3M)", 3_000_000),
+    ("Airliner (6M)", 6_000_000),
+)
+REYNOLDS_PRESET_LABELS = tuple(label for label, _ in REYNOLDS_PRESETS)
+REYNOLDS_PRESET_VALUES = dict(REYNOLDS_PRESETS)
+
+COEFF_METRICS = (("CL", "CL"), ("CD", "CD"), ("L/D", None))
+
+MIN_COORD_ROWS = 10   # backend's minimum point count (MIN_POINTS in main.py)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def count_coordinate_rows(file_content: bytes) -> int:
+    """
+    Rows that start with two numbers. A cheap pre-flight check so files the
+    backend is bound to reject fail here instead of after a network round
+    trip; all repairs and the real validation stay on the backend.
+    """
+    rows = 0
+    for line in file_content.decode("utf-8", "replace").splitlines():
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        try:
+            float(parts[0])
+            float(parts[1])
+        except ValueError:
+            continue
+        rows += 1
+    return rows
+
+# Rate-limited, load-shed, or a proxy error while the free-tier backend wakes up
+RETRYABLE_STATUS = (429, 502, 503, 504)
+
+class BackendBusyError(Exception):
+    """Raised when the backend is still rate-limited or busy after every retry."""
+
+def post_with_retries(url: str, files: dict, data: dict, timeout: float = 90,
+                      max_timeouts: int = 3, admission: RunAdmission = None) -> requests.Response:
+    if admission is not None:
+        admission.charge()
+    max_retries = 5    # rate-limited / busy responses
+    timeouts = 0
     for attempt in range(max_retries):
         try:
-            response = requests.post(url, files=files, data=data, timeout=90)
-            if response.status_code == 429:
-                if attempt < max_retries - 1:
-                    raise Exception(f"Server busy. Retrying in {retry_delay * (attempt + 1)}s... (Attempt {attempt + 1}/{max_retries})")
-                else:
-                    raise Exception("Server is rate-limited. Please wait 60 seconds and try again.")
-            if response.status_code != 200:
-                raise Exception(f"Server Error ({response.status_code}): {response.text}")
-            return response.json()
+            response = get_http_session().post(url, files=files, data=data, timeout=timeout)
         except requests.exceptions.Timeout:
-            if attempt < max_retries - 1:
-                continue
-            raise Exception("Request timeout - backend is taking too long (>90s)")
+            timeouts += 1
+            if timeouts >= max_timeouts:
+                raise Exception(f"Request timeout - backend is taking too long (>{timeout:.0f}s)")
+            time.sleep(backoff_delay(attempt))
+            continue
         except requests.exceptions.ConnectionError:
             raise Exception("Cannot connect to backend server. It may be starting up.")
-        except Exception as e:
-            error_msg = str(e)
-            if "Retrying" in error_msg and attempt < max_retries - 1:
-                time.sleep(retry_delay * (attempt + 1))
+        if response.status_code in RETRYABLE_STATUS:
+            if attempt < max_retries - 1:
+                time.sleep(retry_after_delay(response, attempt))
                 continue
-            raise Exception(error_msg)
+            raise BackendBusyError("Server is rate-limited. Please wait 60 seconds and try again.")
+        if response.status_code != 200:
+            raise Exception(f"Server Error ({response.status_code}): {response.text}")
+        return response
     raise Exception("Max retries exceeded")
 
+# Bodies above this are gzipped before upload; the backend inflates them.
+GZIP_UPLOAD_MIN_BYTES = 4096
+
+def upload_file_field(filename: str, file_content: bytes) -> tuple:
+    if len(file_content) >= GZIP_UPLOAD_MIN_BYTES:
+        return filename, gzip.compress(file_content, compresslevel=6), "application/gzip"
+    return filename, file_content, "text/plain"
+
+def upload_digest(uploaded) -> str:
+    """
+    BLAKE2b digest of an uploaded file, computed once per upload and kept in
+    session state so the analysis cache is keyed on a short hex string.
+    """
+    digests = st.session_state.file_digests
+    if uploaded.file_id not in digests:
+        digests[uploaded.file_id] = hashlib.blake2b(uploaded.getvalue(), digest_size=16).hexdigest()
+    return digests[uploaded.file_id]
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=50)
+def run_xfoil_analysis(_file_content: bytes, file_hash: str, filename: str, reynolds: float, alpha: float,
+                       backend_url: str, _admission: RunAdmission = None):
+    # _file_content and _admission are skipped by the cache hasher; file_hash
+    # identifies the file.
+    response = post_with_retries(
+        f"{backend_url}/upload_airfoil/",
+        files={"file": upload_file_field(filename, _file_content)},
+        data={"reynolds": reynolds, "alpha": alpha},
+        admission=_admission,
+    )
+    return with_result_arrays(orjson.loads(response.content))
+
+# Backend limits for /upload_airfoil_polar/ (MIN_ALPHA/MAX_ALPHA and
+# MAX_POLAR_POINTS in main.py).
+POLAR_ALPHA_RANGE = (-10.0, 20.0)
+POLAR_MAX_POINTS = 41
+# Angles a polar request did not return are retried one at a time (with the
+# backend's smoothing and inviscid fallbacks); no new retry starts after this
+# many seconds into the sweep, so a struggling backend cannot hold it for long.
+SWEEP_FALLBACK_BUDGET_S = 300.0
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=50)
+def run_xfoil_polar(_file_content: bytes, file_hash: str, filename: str, reynolds: float,
+                    alpha_start: float, alpha_end: float, alpha_step: float, backend_url: str,
+                    _admission: RunAdmission = None):
+    """
+    One backend request (one XFOIL session) for a whole alpha sweep. A
+    timeout is not retried: the sweep falls back to per-angle requests.
+    """
+    response = post_with_retries(
+        f"{backend_url}/upload_airfoil_polar/",
+        files={"file": upload_file_field(filename, _file_content)},
+        data={"reynolds": reynolds, "alpha_start": alpha_start,
+              "alpha_end": alpha_end, "alpha_step": alpha_step},
+        timeout=200,
+        max_timeouts=1,
+        admission=_admission,
+    )
+    result = orjson.loads(response.content)
+    result["coords"] = np.asarray(result["coords"], dtype=np.float64).reshape(-1, 2)
+    return result
+
 # ── Layout ────────────────────────────────────────────────────────────────────
 left_col, right_col = st.columns([1, 3])
 
@@ -713,26 +990,14 @@ with left_col:
     if st.button("← Home", use_container_width=True):
         st.switch_page("app.py")
 
-    st.markdown("<br>", unsafe_allow_html=True)
-
-    st.markdown('<p class="param-label">Reynolds Number</p>', unsafe_allow_html=True)
+    st.markdown('<p class="param-label spaced">Reynolds Number</p>', unsafe_allow_html=True)
     reynolds_preset = st.selectbox(
         "Reynolds Preset",
-        ["Custom", "Model Aircraft (50k)", "Small UAV (100k)", "Light Aircraft (500k)",
-         "Glider (1M)", "Small Plane (3M)", "Airliner (6M)"],
+        REYNOLDS_PRESET_LABELS,
         index=3,
         label_visibility="collapsed"
     )
-    reynolds_values = {
-        "Custom": 500_000,
-        "Model Aircraft (50k)": 50_000,
-        "Small UAV (100k)": 100_000,
-        "Light Aircraft (500k)": 500_000,
-        "Glider (1M)": 1_000_000,
-        "Small Plane (3M)": 3_000_000,
-        "Airliner (6M)": 6_000_000
-    }
-    default_re = reynolds_values.get(reynolds_preset, 500_000)
+    default_re = REYNOLDS_PRESET_VALUES.get(reynolds_preset, 500_000)
     reynolds = st.number_input(
         "Reynolds Number Value",
         min_value=1_000, max_value=10_000_000,
@@ -741,9 +1006,7 @@ with left_col:
         label_visibility="collapsed"
     )
 
-    st.markdown("<br>", unsafe_allow_html=True)
-
-    st.markdown('<p class="param-label">Angle of Attack</p>', unsafe_allow_html=True)
+    st.markdown('<p class="param-label spaced">Angle of Attack</p>', unsafe_allow_html=True)
 
     sweep_mode = st.checkbox(
         "AOA Sweep",
@@ -787,7 +1050,6 @@ with left_col:
         n_steps = int(round((alpha_end - alpha_start) / alpha_step)) + 1
         st.caption(f"Total runs: **{n_steps}**")
 
-    st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("---")
 
     with st.expander("ℹ️ About XFOIL"):
@@ -844,6 +1106,9 @@ with right_col:
         uploaded_files = []
         has_upload = uploaded_file is not None
 
+    if has_upload:
+        warm_backend(os.getenv("BACKEND_URL", BACKEND_URL))
+
     if st.session_state.batch_mode:
         btn_label = "🚀 Run Batch Analysis"
     elif st.session_state.sweep_mode:
@@ -860,28 +1125,45 @@ with right_col:
             st.warning("⏳ Analysis already in progress. Please wait...")
             st.stop()
 
+        # Charged against the admission window only when a request of this
+        # run is about to be sent to the backend.
+        admission = RunAdmission()
         st.session_state.analyzing = True
 
         try:
             if st.session_state.batch_mode:
                 # ── Batch Analysis ────────────────────────────────────────
                 files_to_run = uploaded_files[:10]
+                batch_alpha = float(alpha) if not st.session_state.sweep_mode else 5.0
                 batch_rows = []
                 prog = st.progress(0, text="Starting batch analysis...")
                 status_txt = st.empty()
 
-                for i, f in enumerate(files_to_run):
-                    pct = int((i / len(files_to_run)) * 100)
-                    prog.progress(pct, text=f"Analysing {f.name}... ({pct}% complete, {i+1}/{len(files_to_run)} files)")
-                    status_txt.caption(f"File {i+1} of {len(files_to_run)}: {f.name}")
-                    try:
-                        r = run_xfoil_analysis(
-                            file_content=f.getvalue(),
-                            filename=f.name,
-                            reynolds=reynolds,
-                            alpha=float(alpha) if not st.session_state.sweep_mode else 5.0,
-                            backend_url=backend_url
-                        )
+                # Requests are I/O-bound, so a couple run concurrently and the
+                # backend can overlap their XFOIL solves; kept at 2 so the
+                # per-IP rate limit is not tripped straight away.
+                batch_out = [None] * len(files_to_run)
+                throttled = None
+                with ThreadPoolExecutor(max_workers=min(2, len(files_to_run))) as ex:
+                    futures = {
+                        ex.submit(run_xfoil_analysis, f.getvalue(), upload_digest(f), f.name, reynolds,
+                                  batch_alpha, backend_url, admission): i
+                        for i, f in enumerate(files_to_run)
+                    }
+                    for done, fut in enumerate(as_completed(futures), start=1):
+                        i = futures[fut]
+                        try:
+                            batch_out[i] = fut.result()
+                        except SubmissionThrottled as e:
+                            throttled = e
+                        except Exception:
+                            pass
+                        pct = int((done / len(files_to_run)) * 100)
+                        prog.progress(pct, text=f"Analysed {files_to_run[i].name}... ({pct}% complete, {done}/{len(files_to_run)} files)")
+                        status_txt.caption(f"File {done} of {len(files_to_run)} done: {files_to_run[i].name}")
+
+                for f, r in zip(files_to_run, batch_out):
+                    if r is not None:
                         coeffs = r.get("coefficients", {})
                         cl = coeffs.get("CL", None)
                         cd = coeffs.get("CD", None)
@@ -895,15 +1177,20 @@ with right_col:
                             "Cm": round(cm, 4) if cm is not None else "—",
                             "Status": "✅ Converged"
                         })
-                    except Exception:
+                    else:
                         batch_rows.append({
                             "Airfoil": f.name.replace(".dat", ""),
                             "CL": "—", "CD": "—", "L/D": "—", "Cm": "—",
                             "Status": "❌ Failed"
                         })
 
+                if throttled is not None and all(r is None for r in batch_out):
+                    raise throttled
+
                 prog.progress(100, text="✅ Batch complete!")
                 status_txt.empty()
+                if throttled is not None:
+                    st.warning(f"⏳ Files not already cached were skipped. {throttled}")
 
                 n_converged_batch = sum(1 for r in batch_rows if r["Status"] == "✅ Converged")
                 if n_converged_batch > 0:
@@ -924,6 +1211,12 @@ with right_col:
 
             else:
                 file_content = uploaded_file.getvalue()
+                file_hash = upload_digest(uploaded_file)
+                if count_coordinate_rows(file_content) < MIN_COORD_ROWS:
+                    raise Exception(
+                        f"{uploaded_file.name} has fewer than {MIN_COORD_ROWS} x/y coordinate "
+                        f"rows - please check the file format."
+                    )
 
             if st.session_state.sweep_mode:
                 # ── AOA Sweep ─────────────────────────────────────────────
@@ -931,27 +1224,81 @@ with right_col:
                           for i in range(int(round((alpha_end - alpha_start) / alpha_step)) + 1)
                           if round(alpha_start + i * alpha_step, 2) <= alpha_end + 1e-9]
 
-                sweep_rows = []
+                # Angles the backend accepts go out as polar requests of up to
+                # POLAR_MAX_POINTS consecutive angles each; XFOIL solves each
+                # chunk in one session. Angles a chunk did not return (failed
+                # request or unconverged points) are then retried one at a
+                # time. Angles outside its range are reported as failed, as
+                # they were when sent one at a time.
+                lo, hi = POLAR_ALPHA_RANGE
+                valid = [a for a in alphas if lo <= a <= hi]
+                chunks = [valid[i:i + POLAR_MAX_POINTS]
+                          for i in range(0, len(valid), POLAR_MAX_POINTS)]
+
+                polar_by_alpha = {}
+                first_result = None
+                sweep_started = time.monotonic()
                 prog = st.progress(0, text="Starting sweep...")
                 status_txt = st.empty()
 
-                for i, a in enumerate(alphas):
-                    pct = int((i / len(alphas)) * 100)
-                    prog.progress(pct, text=f"Running α = {a}°... ({pct}% complete, {i}/{len(alphas)} steps)")
-                    status_txt.caption(f"Step {i+1} of {len(alphas)}: α = {a}°")
+                for i, chunk in enumerate(chunks):
+                    pct = int((i / len(chunks)) * 100)
+                    prog.progress(pct, text=f"Running α = {chunk[0]}° → {chunk[-1]}°... ({pct}% complete)")
+                    status_txt.caption(f"Request {i+1} of {len(chunks)}: {len(chunk)} angles")
+                    try:
+                        r = run_xfoil_polar(
+                            _file_content=file_content,
+                            file_hash=file_hash,
+                            filename=uploaded_file.name,
+                            reynolds=reynolds,
+                            alpha_start=float(chunk[0]),
+                            alpha_end=float(chunk[-1]),
+                            alpha_step=float(alpha_step),
+                            backend_url=backend_url,
+                            _admission=admission
+                        )
+                    except SubmissionThrottled:
+                        raise
+                    except Exception:
+                        continue
+                    polar = r["polar"]
+                    for a, cl, cd, cm in zip(polar["alpha"], polar["CL"], polar["CD"], polar["Cm"]):
+                        polar_by_alpha[round(a, 2)] = (cl, cd, cm)
+                    if first_result is None:
+                        # Geometry and parser output for the display below
+                        first_result = {"coords": r["coords"], "parser_fixes": r["parser_fixes"]}
+
+                missing = [a for a in valid if a not in polar_by_alpha]
+                for i, a in enumerate(missing):
+                    if time.monotonic() - sweep_started > SWEEP_FALLBACK_BUDGET_S:
+                        break
+                    pct = int((i / len(missing)) * 100)
+                    prog.progress(pct, text=f"Retrying α = {a}° on its own... ({pct}% complete)")
+                    status_txt.caption(f"Retry {i+1} of {len(missing)}: α = {a}°")
                     try:
                         r = run_xfoil_analysis(
-                            file_content=file_content,
+                            _file_content=file_content,
+                            file_hash=file_hash,
                             filename=uploaded_file.name,
                             reynolds=reynolds,
                             alpha=float(a),
-                            backend_url=backend_url
+                            backend_url=backend_url,
+                            _admission=admission
                         )
-                        coeffs = r.get("coefficients", {})
-                        cl = coeffs.get("CL", None)
-                        cd = coeffs.get("CD", None)
-                        cm = coeffs.get("Cm", None)
-                        ld = (cl / cd) if (cl is not None and cd and cd != 0) else None
+                    except SubmissionThrottled:
+                        raise
+                    except Exception:
+                        continue
+                    coeffs = r.get("coefficients", {})
+                    polar_by_alpha[a] = (coeffs.get("CL"), coeffs.get("CD"), coeffs.get("Cm"))
+                    if first_result is None:
+                        first_result = {"coords": r["coords"], "parser_fixes": r["parser_fixes"]}
+
+                sweep_rows = []
+                for a in alphas:
+                    if a in polar_by_alpha:
+                        cl, cd, cm = polar_by_alpha[a]
+                        ld = (cl / cd) if (cl is not None and cd) else None
                         sweep_rows.append({
                             "α (°)": a,
                             "CL": round(cl, 4) if cl is not None else "—",
@@ -960,11 +1307,11 @@ with right_col:
                             "Cm": round(cm, 4) if cm is not None else "—",
                             "Status": "✅ Converged"
                         })
-                    except Exception as step_err:
+                    else:
                         sweep_rows.append({
                             "α (°)": a,
                             "CL": "—", "CD": "—", "L/D": "—", "Cm": "—",
-                            "Status": f"❌ Failed"
+                            "Status": "❌ Failed"
                         })
 
                 prog.progress(100, text="✅ Sweep complete!")
@@ -977,21 +1324,6 @@ with right_col:
                     if new_count:
                         st.toast(f"✅ {n_converged_sweep} sweep steps completed! (Total: #{new_count:,})", icon="🎉")
 
-                # Store first converged result for geometry/parser display
-                first_result = None
-                for a in alphas:
-                    try:
-                        first_result = run_xfoil_analysis(
-                            file_content=file_content,
-                            filename=uploaded_file.name,
-                            reynolds=reynolds,
-                            alpha=float(a),
-                            backend_url=backend_url
-                        )
-                        break
-                    except Exception:
-                        continue
-
                 st.session_state.sweep_results = sweep_rows
                 st.session_state.batch_results = None
                 st.session_state.sweep_params = {
@@ -1009,11 +1341,13 @@ with right_col:
                 # ── Single-point analysis ─────────────────────────────────
                 with st.spinner("Computing... (30-60s on free tier, instant if cached)"):
                     result = run_xfoil_analysis(
-                        file_content=file_content,
+                        _file_content=file_content,
+                        file_hash=file_hash,
                         filename=uploaded_file.name,
                         reynolds=reynolds,
                         alpha=alpha,
-                        backend_url=backend_url
+                        backend_url=backend_url,
+                        _admission=admission
                     )
 
                 new_count = increment_analysis_count()
@@ -1031,17 +1365,14 @@ with right_col:
                 st.session_state.analyzing = False
                 st.success("✅ Simulation completed successfully!")
 
+        except SubmissionThrottled as e:
+            st.session_state.analyzing = False
+            st.warning(f"⏳ {e}")
         except Exception as e:
             st.session_state.analyzing = False
-            error_msg = str(e)
-            if "Retrying" in error_msg:
-                st.warning(f"⏳ {error_msg}")
-                time.sleep(1)
-                st.rerun()
-            else:
-                st.error(f"❌ Error: {error_msg}")
-                if "rate-limited" in error_msg.lower() or "429" in error_msg:
-                    st.info("💡 **Tip:** Free tier has rate limits. Wait 60 seconds before trying again.")
+            st.error(f"❌ Error: {e}")
+            if isinstance(e, BackendBusyError):
+                st.info("💡 **Tip:** Free tier has rate limits. Wait 60 seconds before trying again.")
 
     # ── Batch Results ─────────────────────────────────────────────────────────
     if st.session_state.batch_results is not None:
@@ -1144,21 +1475,8 @@ with right_col:
         if sp.get('first_result'):
             fr = sp['first_result']
             st.markdown("---")
-            coords_after = pd.DataFrame(fr["coords_after"], columns=["x", "y"])
             st.subheader("🛩️ Airfoil Geometry")
-            fig1 = go.Figure()
-            fig1.add_trace(go.Scatter(
-                x=coords_after["x"], y=coords_after["y"],
-                mode='lines', name='Airfoil',
-                line=dict(color='#667eea', width=3),
-                fill='toself', fillcolor='rgba(102, 126, 234, 0.2)',
-            ))
-            fig1.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.3)
-            fig1.update_layout(
-                title=sp['filename'], xaxis_title="x/c", yaxis_title="y/c",
-                height=350, plot_bgcolor='white',
-                yaxis=dict(scaleanchor="x", scaleratio=1)
-            )
+            fig1 = build_geometry_fig(fr["coords"], sp['filename'], height=350)
             st.plotly_chart(fig1, use_container_width=True)
 
             # Parser output box
@@ -1186,7 +1504,7 @@ with right_col:
 
             coord_lines_sweep = "\n".join(
                 f"  {x:.6f}  {y:.6f}"
-                for x, y in fr["coords_after"]
+                for x, y in fr["coords"]
             )
             coord_text_sweep = f"AIRFOIL\n{coord_lines_sweep}"
             with st.expander("📄 View Parsed Coordinates", expanded=False):
@@ -1208,7 +1526,7 @@ with right_col:
             )
             _sweep_name = sp['filename'].replace(".dat", "").replace("_", " ")
             build_lbm_component(
-                coords_after=fr["coords_after"],
+                coords_after=fr["coords"],
                 airfoil_name=_sweep_name,
             )
             with st.expander("ℹ️ About This Visualisation"):
@@ -1231,62 +1549,47 @@ with right_col:
             st.markdown("---")
             st.subheader("📊 Aerodynamic Coefficients")
             coeffs = result["coefficients"]
+            cl, cd = coeffs.get("CL"), coeffs.get("CD")
+            has_ld = cl is not None and cd is not None
+            ld_ratio = cl / cd if has_ld and cd != 0 else None
+            near_zero_lift = has_ld and abs(cl) < 0.001
 
-            if "CL" in coeffs and "CD" in coeffs:
-                ld = coeffs["CL"] / coeffs["CD"] if coeffs["CD"] != 0 else 0
-                if coeffs["CL"] < -0.1:
+            if has_ld:
+                if cl < -0.1:
                     st.warning("⚠️ **Negative Lift Detected!** The airfoil is generating downforce.")
-                elif abs(coeffs["CL"]) < 0.001:
+                elif near_zero_lift:
                     st.info("ℹ️ **Near-Zero Lift:** Symmetric airfoil at zero AoA — L/D not meaningful.")
-                elif abs(last_params['alpha']) >= 12 and (coeffs["CD"] > 0.15 or ld < 5):
+                elif abs(last_params['alpha']) >= 12 and (cd > 0.15 or (ld_ratio or 0) < 5):
                     st.error("🚨 **Possible Stall Condition!** High drag and low L/D suggests flow separation.")
 
             coef_cols = st.columns(3)
-            for idx, (label, key) in enumerate([("CL", "CL"), ("CD", "CD"), ("L/D", None)]):
+            for idx, (label, key) in enumerate(COEFF_METRICS):
                 with coef_cols[idx]:
                     if key and key in coeffs:
                         st.metric(label, f"{coeffs[key]:.4f}")
-                    elif label == "L/D" and "CL" in coeffs and "CD" in coeffs:
-                        if abs(coeffs["CL"]) < 0.001 or coeffs["CD"] == 0:
+                    elif label == "L/D" and has_ld:
+                        if near_zero_lift or ld_ratio is None:
                             st.metric(label, "~0", help="CL ≈ 0, L/D not meaningful")
                         else:
-                            ld_ratio = coeffs["CL"] / coeffs["CD"]
                             st.metric(label, f"{ld_ratio:.2f}",
                                       help="Negative L/D = downforce" if ld_ratio < 0 else None)
                     else:
                         st.metric(label, "N/A")
 
-        coords_after = pd.DataFrame(result["coords_after"], columns=["x", "y"])
         st.markdown("---")
         plot_col1, plot_col2 = st.columns(2)
 
         with plot_col1:
             st.subheader("🛩️ Airfoil Geometry")
-            fig1 = go.Figure()
-            fig1.add_trace(go.Scatter(
-                x=coords_after["x"], y=coords_after["y"],
-                mode='lines', name='Airfoil',
-                line=dict(color='#667eea', width=3),
-                fill='toself', fillcolor='rgba(102, 126, 234, 0.2)',
-                hovertemplate='x: %{x:.4f}<br>y: %{y:.4f}<extra></extra>'
-            ))
-            fig1.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.3)
-            fig1.add_vline(x=0, line_dash="dash", line_color="gray", opacity=0.3)
-            fig1.update_layout(
-                title=last_params['filename'],
-                xaxis_title="x/c", yaxis_title="y/c",
-                height=400, hovermode='closest',
-                plot_bgcolor='white',
-                yaxis=dict(scaleanchor="x", scaleratio=1)
-            )
-            fig1.update_xaxes(showgrid=True, gridcolor='lightgray')
-            fig1.update_yaxes(showgrid=True, gridcolor='lightgray')
+            fig1 = build_geometry_fig(result["coords"], last_params['filename'])
             st.plotly_chart(fig1, use_container_width=True)
 
             with st.expander("🔍 Geometry Details"):
-                st.write(f"**Points:** {len(coords_after)}")
-                st.write(f"**Max thickness:** {(coords_after['y'].max() - coords_after['y'].min()):.4f}")
-                st.write(f"**Chord length:** {coords_after['x'].max() - coords_after['x'].min():.4f}")
+                coords_arr = result["coords"]
+                mins, maxs = coords_arr.min(axis=0), coords_arr.max(axis=0)
+                st.write(f"**Points:** {coords_arr.shape[0]}")
+                st.write(f"**Max thickness:** {maxs[1] - mins[1]:.4f}")
+                st.write(f"**Chord length:** {maxs[0] - mins[0]:.4f}")
 
         # ── Parsed Coordinate Box ─────────────────────────────────────────────
         st.markdown("---")
@@ -1327,7 +1630,7 @@ with right_col:
         # Coordinate output
         coord_lines = "\n".join(
             f"  {x:.6f}  {y:.6f}"
-            for x, y in result["coords_after"]
+            for x, y in result["coords"]
         )
         coord_text = f"AIRFOIL\n{coord_lines}"
 
@@ -1341,34 +1644,10 @@ with right_col:
             )
 
         with plot_col2:
-            if result["cp_x"] and result["cp_values"]:
+            if len(result["cp_x"]) and len(result["cp_values"]):
                 st.subheader("📈 Pressure Distribution")
-                cp_x = np.array(result["cp_x"])
-                cp_values = np.array(result["cp_values"])
-                fig2 = go.Figure()
-                mid_idx = len(cp_x) // 2
-                fig2.add_trace(go.Scatter(
-                    x=cp_x[:mid_idx], y=cp_values[:mid_idx],
-                    mode='lines', name='Upper surface',
-                    line=dict(color='#3b82f6', width=3),
-                    hovertemplate='x/c: %{x:.4f}<br>Cp: %{y:.4f}<extra></extra>'
-                ))
-                fig2.add_trace(go.Scatter(
-                    x=cp_x[mid_idx:], y=cp_values[mid_idx:],
-                    mode='lines', name='Lower surface',
-                    line=dict(color='#ef4444', width=3),
-                    hovertemplate='x/c: %{x:.4f}<br>Cp: %{y:.4f}<extra></extra>'
-                ))
-                fig2.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.3)
-                fig2.update_layout(
-                    title=f"Re = {last_params['reynolds']:,.0f}, α = {last_params['alpha']}°",
-                    xaxis_title="x/c", yaxis_title="Cp",
-                    height=400, hovermode='closest',
-                    plot_bgcolor='white',
-                    yaxis=dict(autorange='reversed')
-                )
-                fig2.update_xaxes(showgrid=True, gridcolor='lightgray')
-                fig2.update_yaxes(showgrid=True, gridcolor='lightgray')
+                fig2 = build_cp_fig(result["cp_x"], result["cp_values"],
+                                    last_params['reynolds'], last_params['alpha'])
                 st.plotly_chart(fig2, use_container_width=True)
 
                 with st.expander("📖 Understanding Cp"):
@@ -1384,15 +1663,12 @@ with right_col:
                 st.warning("⚠️ No pressure coefficient data available")
 
         st.markdown("---")
-        if st.button("💾 Download Results as CSV"):
-            csv_data = pd.DataFrame({'x': result["cp_x"], 'Cp': result["cp_values"]})
-            csv = csv_data.to_csv(index=False)
-            st.download_button(
-                label="Download Cp Data",
-                data=csv,
-                file_name=f"{last_params['filename'].replace('.dat', '')}_cp_results.csv",
-                mime="text/csv"
-            )
+        st.download_button(
+            label="💾 Download Results as CSV",
+            data=cp_csv_bytes(result["cp_x"], result["cp_values"]),
+            file_name=f"{last_params['filename'].replace('.dat', '')}_cp_results.csv",
+            mime="text/csv"
+        )
 
         # ── Airflow Visualization (LBM Wind Tunnel) ─────────────────────────
         st.markdown("---")
@@ -1411,7 +1687,7 @@ with right_col:
         )
 
         build_lbm_component(
-            coords_after=result["coords_after"],
+            coords_after=result["coords"],
             airfoil_name=_airfoil_display_name,
         )
 
@@ -2,22 +2,49 @@
 test_main.py — Unit tests for AeroLab backend (main.py)
 
 Tests cover:
-  - parse_dat_file: coordinate parsing and validation
+  - parse_dat_file / parse_dat_text: coordinate parsing and validation
+  - read_upload: size-capped reading and gzip inflation of upload bodies
   - detect_and_merge_sections: Selig vs Lednicer format handling,
     winding order correction, duplicate point removal
+  - validate_coords: pre-XFOIL geometry sanity checks
+  - needs_repanel: detection of contours already at XFOIL's panelling
   - extract_aerodynamic_coefficients: regex extraction from XFOIL stdout
+  - parse_polar_file: XFOIL PACC polar output parsing
+  - polar_point_count: sweep size check against MAX_POLAR_POINTS
+  - WorkDirPool: per-request working directory recycling
+  - ResultCache: LRU memoisation of XFOIL results
+  - sweep_stale_dirs: cleanup of abandoned working directories
+  - xfoil_slot: solver-slot admission and load shedding
+  - run_xfoil: speculative inviscid fallback and its solver slot
+  - XfoilPool: Popen fallback for event loops without subprocess support
 
 Run with:  pytest test_main.py -v
 """
 
+import asyncio
+import gc
+import gzip
+import io
 import os
 import tempfile
+import numpy as np
 import pytest
 
+import main
 from main import (
     parse_dat_file,
+    parse_dat_text,
+    read_upload,
     detect_and_merge_sections,
+    validate_coords,
+    needs_repanel,
     extract_aerodynamic_coefficients,
+    parse_polar_file,
+    polar_point_count,
+    WorkDirPool,
+    ResultCache,
+    sweep_stale_dirs,
+    xfoil_slot,
 )
 
 
@@ -56,7 +83,7 @@ class TestParseDatFile:
 
     def test_parses_valid_selig(self, tmp_path):
         path = write_dat(tmp_path, naca0012_selig())
-        coords = parse_dat_file(path)
+        coords, _ = parse_dat_file(path)
         assert len(coords) >= 10
         xs = [pt[0] for pt in coords]
         assert all(0.0 <= x <= 1.0 for x in xs), "All x coords should be in [0, 1]"
@@ -66,7 +93,7 @@ class TestParseDatFile:
                                   for x, y in zip([1, 0.75, 0.5, 0.25, 0, 0.25, 0.5, 0.75, 1, 0.5],
                                                   [0, 0.01, 0.02, 0.03, 0, -0.03, -0.02, -0.01, 0, 0])]
         path = write_dat(tmp_path, lines)
-        coords = parse_dat_file(path)
+        coords, _ = parse_dat_file(path)
         # Header should be silently skipped
         assert all(isinstance(pt[0], float) for pt in coords)
 
@@ -74,7 +101,7 @@ class TestParseDatFile:
         lines = naca0012_selig()
         lines_with_blanks = lines[:5] + ["", "  "] + lines[5:]
         path = write_dat(tmp_path, lines_with_blanks)
-        coords = parse_dat_file(path)
+        coords, _ = parse_dat_file(path)
         assert len(coords) >= 10
 
     def test_rejects_out_of_range_coords(self, tmp_path):
@@ -98,14 +125,62 @@ class TestParseDatFile:
                                       [1, 0.75, 0.5, 0.25, 0, 0.25, 0.5, 0.75, 1, 0.5, 0.3],
                                       [0, 0.01, 0.02, 0.03, 0, -0.03, -0.02, -0.01, 0, 0, 0])]
         path = write_dat(tmp_path, lines)
-        coords = parse_dat_file(path)
+        coords, _ = parse_dat_file(path)
         assert len(coords) >= 10
 
+    def test_reports_skipped_and_filtered_counts(self, tmp_path):
+        lines = ["NACA 0012", "# comment line"] + naca0012_selig()[1:] + ["5.0  0.0"]
+        path = write_dat(tmp_path, lines)
+        coords, fixes = parse_dat_file(path)
+        assert len(coords) == 13
+        assert any("2 header/comment" in f for f in fixes)
+        assert any("1 point(s)" in f for f in fixes)
+
     def test_file_not_found_raises(self):
         from fastapi import HTTPException
         with pytest.raises((HTTPException, FileNotFoundError, Exception)):
             parse_dat_file("/nonexistent/path/file.dat")
 
+    def test_text_matches_file(self, tmp_path):
+        lines = naca0012_selig()
+        from_file, file_fixes = parse_dat_file(write_dat(tmp_path, lines))
+        from_text, text_fixes = parse_dat_text("\n".join(lines))
+        np.testing.assert_array_equal(from_file, from_text)
+        assert file_fixes == text_fixes
+
+
+# ── read_upload ────────────────────────────────────────────────────────────
+
+class TestReadUpload:
+
+    def test_decodes_body(self):
+        body = "\n".join(naca0012_selig()).encode()
+        assert read_upload(io.BytesIO(body)) == body.decode()
+
+    def test_rejects_oversized_body(self):
+        from fastapi import HTTPException
+        with pytest.raises(HTTPException) as exc:
+            read_upload(io.BytesIO(b"0" * (main.MAX_FILE_SIZE + 1)))
+        assert exc.value.status_code == 413
+
+    def test_inflates_gzip_body(self):
+        body = "\n".join(naca0012_selig()).encode()
+        assert read_upload(io.BytesIO(gzip.compress(body))) == body.decode()
+
+    def test_rejects_oversized_gzip_body(self):
+        from fastapi import HTTPException
+        bomb = gzip.compress(b"0" * (main.MAX_FILE_SIZE + 1))
+        with pytest.raises(HTTPException) as exc:
+            read_upload(io.BytesIO(bomb))
+        assert exc.value.status_code == 413
+
+    def test_rejects_truncated_gzip_body(self):
+        from fastapi import HTTPException
+        body = gzip.compress("\n".join(naca0012_selig()).encode())
+        with pytest.raises(HTTPException) as exc:
+            read_upload(io.BytesIO(body[:-12]))
+        assert exc.value.status_code == 400
+
 
 # ── detect_and_merge_sections ──────────────────────────────────────────────
 
@@ -118,7 +193,7 @@ class TestDetectAndMergeSections:
             [0.0, 0.0],
             [0.25, -0.041], [0.5, -0.030], [0.75, -0.016], [1.0, -0.001],
         ]
-        result = detect_and_merge_sections(data)
+        result, _ = detect_and_merge_sections(data)
         assert len(result) >= 8
 
     def test_lednicer_format_detected(self):
@@ -126,9 +201,9 @@ class TestDetectAndMergeSections:
         upper = [[0.0, 0.0], [0.25, 0.041], [0.5, 0.030], [0.75, 0.016], [1.0, 0.001]]
         lower = [[0.0, 0.0], [0.25, -0.041], [0.5, -0.030], [0.75, -0.016], [1.0, -0.001]]
         data = upper + lower
-        result = detect_and_merge_sections(data)
-        # Result should be a single merged list
-        assert isinstance(result, list)
+        result, _ = detect_and_merge_sections(data)
+        # Result should be a single merged (N, 2) array
+        assert result.ndim == 2 and result.shape[1] == 2
         assert len(result) > 0
 
     def test_naca6series_closed_te_regression(self):
@@ -148,7 +223,7 @@ class TestDetectAndMergeSections:
             [1.00000, 0.00000],
         ]
         n_before = len(data)
-        result = detect_and_merge_sections(data)
+        result, _ = detect_and_merge_sections(data)
         assert len(result) == n_before, "No point should be dropped"
         assert result[-1][0] == 1.0 and abs(result[-1][1]) < 1e-6, \
             "Final trailing-edge point must be preserved"
@@ -164,7 +239,7 @@ class TestDetectAndMergeSections:
             [0.25, -0.041], [0.5, -0.030], [0.75, -0.016], [1.0, 0.0],
         ]
         n_before = len(data)
-        result = detect_and_merge_sections(data)
+        result, _ = detect_and_merge_sections(data)
         # The closing TE point should still be there — no point dropped.
         assert len(result) == n_before, \
             "Closed trailing edge point was incorrectly removed"
@@ -181,7 +256,7 @@ class TestDetectAndMergeSections:
             [0.0, 0.0],
             [0.25, 0.041], [0.5, 0.030], [0.75, 0.016], [1.0, 0.001],
         ]
-        result = detect_and_merge_sections(data_reversed)
+        result, _ = detect_and_merge_sections(data_reversed)
         # After correction the point just before LE (x≈0) should have positive y
         le_idx = min(range(len(result)), key=lambda i: result[i][0])
         if le_idx > 0:
@@ -193,12 +268,99 @@ class TestDetectAndMergeSections:
         upper = [[0.0, 0.0], [0.25, 0.041], [0.5, 0.030], [0.75, 0.016], [1.0, 0.001]]
         lower = [[0.0, 0.0], [0.25, -0.041], [0.5, -0.030], [0.75, -0.016], [1.0, -0.001]]
         data = upper + lower
-        result = detect_and_merge_sections(data)
+        result, _ = detect_and_merge_sections(data)
         # Count how many times (0, 0) appears — should be at most 1
         le_count = sum(1 for pt in result if abs(pt[0]) < 0.001 and abs(pt[1]) < 0.001)
         assert le_count <= 1, f"Duplicate LE not removed: found {le_count} LE points"
 
 
+# ── validate_coords ───────────────────────────────────────────────────────
+
+class TestValidateCoords:
+
+    SELIG = [
+        [1.0, 0.001], [0.75, 0.016], [0.5, 0.030], [0.25, 0.041], [0.1, 0.03],
+        [0.0, 0.0],
+        [0.1, -0.03], [0.25, -0.041], [0.5, -0.030], [0.75, -0.016], [1.0, -0.001],
+    ]
+
+    def test_accepts_valid_selig(self):
+        validate_coords(self.SELIG)   # should not raise
+
+    def test_rejects_too_few_points(self):
+        from fastapi import HTTPException
+        with pytest.raises(HTTPException):
+            validate_coords(self.SELIG[:5])
+
+    def test_rejects_short_chord(self):
+        from fastapi import HTTPException
+        data = [[0.5 + 0.01 * i, 0.01 * (i % 2)] for i in range(12)]
+        with pytest.raises(HTTPException):
+            validate_coords(data)
+
+    def test_rejects_collinear(self):
+        from fastapi import HTTPException
+        data = [[1.0 - i / 10, 0.0] for i in range(11)]
+        with pytest.raises(HTTPException):
+            validate_coords(data)
+
+    def test_rejects_contour_not_starting_at_te(self):
+        """A loop starting at the leading edge is not a valid XFOIL contour."""
+        from fastapi import HTTPException
+        le_first = self.SELIG[5:] + self.SELIG[:5]
+        with pytest.raises(HTTPException):
+            validate_coords(le_first)
+
+    def test_rejects_x_reversal_after_leading_edge(self):
+        from fastapi import HTTPException
+        shuffled = [row[:] for row in self.SELIG]
+        shuffled[7], shuffled[8] = shuffled[8], shuffled[7]
+        with pytest.raises(HTTPException, match="Non-monotonic x"):
+            validate_coords(shuffled)
+
+    def test_tolerates_small_x_noise(self):
+        noisy = [row[:] for row in self.SELIG]
+        noisy[7][0] = noisy[8][0] + 0.0005   # x backs up by 0.05% chord
+        validate_coords(noisy)   # should not raise
+
+
+# ── needs_repanel ──────────────────────────────────────────────────────────
+
+def cosine_contour(n):
+    """n-point symmetric Selig contour with cosine spacing (TE → LE → TE)."""
+    theta = np.linspace(0.0, 2.0 * np.pi, n)
+    x = 0.5 * (1.0 + np.cos(theta))
+    y = 0.06 * np.sqrt(np.clip(x * (1.0 - x), 0.0, None)) * np.sign(np.pi - theta)
+    return np.column_stack([x, y])
+
+
+class TestNeedsRepanel:
+
+    def test_canonical_160_point_contour_skips_pane(self):
+        assert needs_repanel(cosine_contour(160)) is False
+
+    def test_other_point_counts_repanel(self):
+        assert needs_repanel(cosine_contour(61)) is True
+
+    def test_non_monotonic_surface_repanels(self):
+        coords = cosine_contour(160)
+        coords[[10, 11]] = coords[[11, 10]]
+        assert needs_repanel(coords) is True
+
+    def test_irregular_spacing_repanels(self):
+        coords = cosine_contour(160)
+        coords[40] = coords[41] + 0.1 * (coords[40] - coords[41])
+        assert needs_repanel(coords) is True
+
+    def test_uniform_x_spacing_repanels(self):
+        """160 points with no leading-edge clustering still go through PANE."""
+        x = np.linspace(1.0, 0.0, 80)
+        x = np.concatenate([x, x[-2::-1]])
+        y = 0.06 * np.sqrt(x * (1.0 - x)) * np.where(np.arange(len(x)) < 80, 1.0, -1.0)
+        assert len(x) == 159
+        assert needs_repanel(np.column_stack([x, y])) is True
+
+
 # ── extract_aerodynamic_coefficients ──────────────────────────────────────
 
 class TestExtractAerodynamicCoefficients:
@@ -240,6 +402,20 @@ class TestExtractAerodynamicCoefficients:
         assert abs(coeffs["CL"] - 0.6352) < 1e-4, \
             "Should use last (converged) CL value, not first"
 
+    def test_cdp_and_cdf_do_not_clobber_cd(self):
+        stdout = "  Cm = -0.0521   CD = 0.009241  =>  CDf = 0.001429  CDp = 0.007812"
+        coeffs = extract_aerodynamic_coefficients(stdout)
+        assert abs(coeffs["CD"] - 0.009241) < 1e-6
+        assert abs(coeffs["CDp"] - 0.007812) < 1e-6
+        assert "CDf" not in coeffs
+
+    def test_finds_coefficients_before_long_trailing_output(self):
+        stdout = ("  CL =  0.6352   CD = 0.009241   CDp = 0.007812   Cm = -0.0521\n"
+                  + "  iteration noise\n" * 1000)
+        coeffs = extract_aerodynamic_coefficients(stdout)
+        assert abs(coeffs["CL"] - 0.6352) < 1e-4
+        assert set(coeffs) == {"CL", "CD", "CDp", "Cm"}
+
     def test_returns_empty_dict_on_no_match(self):
         coeffs = extract_aerodynamic_coefficients("XFOIL  Version 6.99\n\n")
         assert coeffs == {}
@@ -252,4 +428,315 @@ class TestExtractAerodynamicCoefficients:
     def test_handles_zero_alpha(self):
         stdout = "  CL =  0.0000   CD = 0.006500   CDp = 0.005200   Cm =  0.0000"
         coeffs = extract_aerodynamic_coefficients(stdout)
-        assert abs(coeffs["CL"]) < 1e-4
\ No newline at end of file
+        assert abs(coeffs["CL"]) < 1e-4
+
+# ── parse_polar_file ───────────────────────────────────────────────────────
+
+class TestParsePolarFile:
+
+    POLAR = [
+        " XFOIL         Version 6.99",
+        "",
+        " Calculated polar for: NACA 0012",
+        "",
+        " 1 1 Reynolds number fixed          Mach number fixed",
+        "",
+        " xtrf =   1.000 (top)        1.000 (bottom)",
+        " Mach =   0.000     Re =     0.500 e 6     Ncrit =   9.000",
+        "",
+        "  alpha    CL        CD       CDp       CM     Top_Xtr  Bot_Xtr",
+        " ------ -------- --------- --------- -------- -------- --------",
+        "  0.000   0.0000   0.00595   0.00121   0.0000   0.6981   0.6981",
+        "  2.000   0.2195   0.00612   0.00138  -0.0012   0.5802   0.8077",
+    ]
+
+    def test_parses_data_rows_only(self, tmp_path):
+        path = write_dat(tmp_path, self.POLAR)
+        polar = parse_polar_file(path)
+        assert list(polar["alpha"]) == [0.0, 2.0]
+        assert abs(polar["CL"][1] - 0.2195) < 1e-6
+        assert abs(polar["Cm"][1] + 0.0012) < 1e-6
+
+    def test_missing_file_gives_empty_polar(self, tmp_path):
+        polar = parse_polar_file(str(tmp_path / "nope.out"))
+        assert all(len(v) == 0 for v in polar.values())
+
+
+# ── polar_point_count ──────────────────────────────────────────────────────
+
+class TestPolarPointCount:
+
+    def test_non_dyadic_step_at_the_limit(self):
+        # (-7.97 - -9.97) / 0.05 + 1 == 41.000000000000014 in floating point
+        assert polar_point_count(-9.97, -7.97, 0.05) == main.MAX_POLAR_POINTS
+
+    def test_one_step_past_the_limit(self):
+        assert polar_point_count(-9.97, -7.92, 0.05) == main.MAX_POLAR_POINTS + 1
+
+    def test_single_angle(self):
+        assert polar_point_count(5.0, 5.0, 0.5) == 1
+
+
+# ── WorkDirPool ────────────────────────────────────────────────────────────
+
+class TestWorkDirPool:
+
+    @pytest.fixture
+    def pool(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(main, "TMP_DIR", str(tmp_path))
+        p = WorkDirPool(size=1)
+        p.start()
+        yield p
+        p.shutdown()
+
+    def test_release_clears_run_files_and_recycles(self, pool):
+        d = pool.acquire()
+        for name in ("airfoil.dat", "cp_output.txt", "stray.tmp"):
+            open(os.path.join(d, name), "w").close()
+        pool.release(d)
+        assert pool.acquire() == d
+        assert os.listdir(d) == []
+
+    def test_falls_back_to_temp_dir_when_exhausted(self, pool):
+        pooled = pool.acquire()
+        extra = pool.acquire()
+        assert extra != pooled and os.path.isdir(extra)
+        assert os.path.dirname(extra) == os.path.dirname(pooled) == main.work_root()
+        pool.release(extra)
+        assert not os.path.exists(extra)
+
+
+# ── ResultCache ────────────────────────────────────────────────────────────
+
+class TestResultCache:
+
+    def test_key_depends_on_geometry_and_conditions(self):
+        coords = [[1.0, 0.0], [0.0, 0.0], [1.0, -0.01]]
+        k = ResultCache.key(coords, 5e5, 5.0)
+        assert k == ResultCache.key(coords, 5e5, 5.0)
+        assert k != ResultCache.key(coords, 5e5, 5.01)
+        assert k != ResultCache.key([[1.0, 0.0], [0.0, 0.0], [1.0, -0.02]], 5e5, 5.0)
+
+    def test_only_viscous_results_are_cacheable(self):
+        assert ResultCache.cacheable(([], [], {"CL": 0.5, "mode": "viscous"}, {}))
+        assert not ResultCache.cacheable(([], [], {"CL": 0.5, "mode": "inviscid"}, None))
+
+    def test_evicts_least_recently_used(self):
+        cache = ResultCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+
+    def test_disk_round_trip(self, tmp_path):
+        cache = ResultCache(maxsize=1, disk_dir=str(tmp_path))
+        key = ResultCache.key([[1.0, 0.0], [0.0, 0.0]], 5e5, 5.0)
+        value = (np.array([1.0, 0.5]), np.array([0.2, -0.8]), {"CL": 0.55, "mode": "viscous"}, None)
+        assert cache.load(key) is None
+        cache.store(key, value)
+        cp_x, cp_values, coefficients, bl_data = cache.load(key)
+        assert cp_x == [1.0, 0.5] and cp_values == [0.2, -0.8]
+        assert coefficients == {"CL": 0.55, "mode": "viscous"} and bl_data is None
+
+    def test_concurrent_disk_stores_of_one_key(self, tmp_path):
+        from concurrent.futures import ThreadPoolExecutor
+        cache = ResultCache(maxsize=1, disk_dir=str(tmp_path))
+        key = ResultCache.key([[1.0, 0.0], [0.0, 0.0]], 5e5, 5.0)
+        value = (np.linspace(0, 1, 2000), np.linspace(-1, 1, 2000), {"CL": 0.55, "mode": "viscous"}, None)
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            list(ex.map(lambda _: cache.store(key, value), range(32)))
+        assert os.listdir(tmp_path) == [os.path.basename(cache._disk_path(key))]
+        assert len(cache.load(key)[0]) == 2000
+
+    def test_disk_skips_inviscid_results(self, tmp_path):
+        cache = ResultCache(maxsize=1, disk_dir=str(tmp_path))
+        key = ResultCache.key([[1.0, 0.0], [0.0, 0.0]], 5e5, 5.0)
+        cache.store(key, ([1.0], [0.2], {"CL": 0.55, "mode": "inviscid"}, None))
+        assert os.listdir(tmp_path) == []
+        # An entry written before the check is ignored on load.
+        with open(cache._disk_path(key), "wb") as f:
+            f.write(b'{"cp_x":[1.0],"cp_values":[0.2],"coefficients":{"mode":"inviscid"},"bl_data":null}')
+        assert cache.load(key) is None
+
+
+# ── sweep_stale_dirs ───────────────────────────────────────────────────────
+
+class TestSweepStaleDirs:
+
+    @pytest.fixture
+    def root(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(main, "TMP_DIR", str(tmp_path))
+        return tmp_path / main.WORK_SUBDIR
+
+    def test_removes_only_stale_run_dirs(self, root):
+        root.mkdir()
+        old, fresh = root / "run_old", root / "run_fresh"
+        old.mkdir()
+        fresh.mkdir()
+        (root / "unrelated").mkdir()
+        os.utime(old, (0, 0))
+        assert sweep_stale_dirs(max_age=3600) == 1
+        assert not old.exists() and fresh.exists() and (root / "unrelated").exists()
+
+    def test_ignores_dirs_outside_work_root(self, root):
+        foreign = root.parent / "run_other_app"
+        foreign.mkdir()
+        os.utime(foreign, (0, 0))
+        assert sweep_stale_dirs(max_age=3600) == 0
+        assert foreign.exists()
+
+    @pytest.mark.skipif(os.name == "nt", reason="pool sweep is POSIX-only")
+    def test_keeps_pool_dirs_of_live_processes(self, root):
+        live = root / f"pool_{os.getpid()}_0"
+        live.mkdir(parents=True)
+        assert sweep_stale_dirs(max_age=3600) == 0
+        assert live.exists()
+
+
+# ── xfoil_slot ─────────────────────────────────────────────────────────────
+
+class TestXfoilSlot:
+
+    @pytest.fixture(autouse=True)
+    def one_slot(self, monkeypatch):
+        monkeypatch.setattr(main, "xfoil_semaphore", asyncio.Semaphore(1))
+        monkeypatch.setattr(main, "XFOIL_MAX_QUEUE", 1)
+
+    def test_sheds_when_queue_is_full(self):
+        from fastapi import HTTPException
+
+        async def scenario():
+            async def waiter():
+                async with xfoil_slot():
+                    pass
+
+            async with xfoil_slot():
+                queued = asyncio.create_task(waiter())
+                await asyncio.sleep(0)
+                with pytest.raises(HTTPException) as exc:
+                    async with xfoil_slot():
+                        pass
+            await queued
+            return exc.value.status_code
+
+        assert asyncio.run(scenario()) == 503
+        assert main._xfoil_waiting == 0
+
+    def test_releases_slot_on_error(self):
+        async def scenario():
+            with pytest.raises(RuntimeError):
+                async with xfoil_slot():
+                    raise RuntimeError
+            return main.xfoil_semaphore.locked()
+
+        assert asyncio.run(scenario()) is False
+
+
+# ── run_xfoil ──────────────────────────────────────────────────────────────
+
+class TestRunXfoilFallback:
+
+    @pytest.fixture
+    def solver(self, monkeypatch):
+        """Stub _run_xfoil_mode: strategy 1 fails, strategy 2 succeeds slowly."""
+        calls = []
+
+        async def fake_mode(coords, cp, bl, work_dir, reynolds, alpha, viscous, timeout,
+                            smooth_geometry=False, repanel=True, log_filename=None):
+            name = "inviscid" if not viscous else ("smoothed" if smooth_geometry else "clean")
+            calls.append(name)
+            fake_mode.outputs[name] = {cp, bl, log_filename or "xfoil_output.log"}
+            if name == "clean":
+                raise Exception("Viscous convergence failed")
+            if name == "inviscid":
+                raise Exception("inviscid failed")
+            await asyncio.sleep(0.01)
+            calls.append("smoothed done")
+            return name
+
+        fake_mode.outputs = {}
+        monkeypatch.setattr(main, "_run_xfoil_mode", fake_mode)
+        return calls
+
+    def run(self):
+        async def scenario():
+            errors = []
+            asyncio.get_running_loop().set_exception_handler(lambda loop, ctx: errors.append(ctx))
+            async with xfoil_slot():
+                result = await main.run_xfoil("airfoil.dat", 1e6, 2.0, main.TMP_DIR)
+            gc.collect()
+            await asyncio.sleep(0)
+            return result, errors, main.xfoil_semaphore.locked()
+
+        return asyncio.run(scenario())
+
+    def test_failed_speculative_run_is_retrieved(self, solver, monkeypatch):
+        monkeypatch.setattr(main, "xfoil_semaphore", asyncio.Semaphore(2))
+        result, errors, locked = self.run()
+        assert result == "smoothed"
+        assert solver.index("inviscid") < solver.index("smoothed done")
+        assert errors == []
+        assert locked is False
+
+    def test_speculative_run_writes_its_own_files(self, solver, monkeypatch):
+        monkeypatch.setattr(main, "xfoil_semaphore", asyncio.Semaphore(2))
+        self.run()
+        outputs = main._run_xfoil_mode.outputs
+        assert not outputs["inviscid"] & outputs["smoothed"]
+
+    def test_no_speculative_run_without_a_free_slot(self, solver, monkeypatch):
+        monkeypatch.setattr(main, "xfoil_semaphore", asyncio.Semaphore(1))
+        result, errors, locked = self.run()
+        assert result == "smoothed"
+        assert "inviscid" not in solver
+        assert locked is False
+
+
+# ── XfoilPool ──────────────────────────────────────────────────────────────
+
+@pytest.mark.skipif(os.name == "nt", reason="uses a POSIX shell script as XFOIL")
+class TestXfoilPoolPopenFallback:
+
+    @pytest.fixture
+    def fake_xfoil(self, tmp_path, monkeypatch):
+        """Point XFOIL at a shell script on a loop that cannot spawn subprocesses."""
+        def install(body):
+            exe = tmp_path / "xfoil"
+            exe.write_text("#!/bin/sh\n" + body + "\n")
+            exe.chmod(0o755)
+            monkeypatch.setattr(main, "XFOIL_RESOLVED", str(exe))
+
+        async def no_subprocesses(*args, **kwargs):
+            raise NotImplementedError
+
+        monkeypatch.setattr(main, "TMP_DIR", str(tmp_path))
+        monkeypatch.setattr(asyncio, "create_subprocess_exec", no_subprocesses)
+        return install
+
+    def test_runs_script_through_popen(self, fake_xfoil):
+        fake_xfoil("exec cat")
+
+        async def scenario():
+            pool = main.XfoilPool(size=0)
+            proc = await pool.acquire()
+            stdout, _ = await main.XfoilPool.run(proc, "QUIT\n", timeout=5)
+            return pool.use_popen, stdout, proc.returncode
+
+        use_popen, stdout, returncode = asyncio.run(scenario())
+        assert use_popen is True
+        assert stdout.endswith("QUIT\n")
+        assert returncode == 0
+
+    def test_timeout_kills_popen_process(self, fake_xfoil):
+        import subprocess
+        fake_xfoil("exec sleep 30")
+
+        async def scenario():
+            proc = await main.XfoilPool(size=0).acquire()
+            with pytest.raises(subprocess.TimeoutExpired):
+                await main.XfoilPool.run(proc, "QUIT\n", timeout=0.2)
+            return proc.returncode
+
+        assert asyncio.run(scenario()) is not None